@@ -27,6 +27,7 @@ async def get_task_records(
     trigger_type: Optional[str] = Query(None, description="触发类型筛选"),
     start_date: Optional[str] = Query(None, description="开始日期筛选 (YYYY-MM-DD)"),
     end_date: Optional[str] = Query(None, description="结束日期筛选 (YYYY-MM-DD)"),
+    cursor: Optional[str] = Query(None, description="翻页游标（上一页返回的 next_cursor），提供时忽略 offset"),
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
@@ -35,6 +36,7 @@ async def get_task_records(
     
     - **limit**: 每页记录数 (1-200)
     - **offset**: 偏移量
+    - **cursor**: 翻页游标，深翻页时优先使用
     - **task_type**: 任务类型筛选 (batch_analysis, manual_analysis, cleanup等)
     - **status**: 状态筛选 (running, completed, failed, cancelled)
     - **trigger_type**: 触发类型筛选 (scheduled, manual)
@@ -58,6 +60,15 @@ async def get_task_records(
             except ValueError:
                 raise HTTPException(status_code=400, detail="结束日期格式错误，请使用 YYYY-MM-DD 格式")
         
+        # 解析翻页游标：<start_time ISO格式>_<id>
+        cursor_key = None
+        if cursor:
+            try:
+                cursor_time, cursor_id = cursor.rsplit("_", 1)
+                cursor_key = (datetime.fromisoformat(cursor_time), int(cursor_id))
+            except ValueError:
+                raise HTTPException(status_code=400, detail="翻页游标格式错误")
+        
         # 获取任务记录
         records = task_record.get_task_records(
             db=db,
@@ -67,9 +78,14 @@ async def get_task_records(
             status=status,
             trigger_type=trigger_type,
             start_date=start_datetime,
-            end_date=end_datetime
+            end_date=end_datetime,
+            cursor=cursor_key
         )
         
+        next_cursor = None
+        if len(records) == limit and records[-1].get("start_time") and records[-1].get("id"):
+            next_cursor = f"{records[-1]['start_time']}_{records[-1]['id']}"
+        
         # 🔥 为每个任务记录添加终止状态标识
         enhanced_records = []
         for record in records:
@@ -97,7 +113,8 @@ async def get_task_records(
             "pagination": {
                 "limit": limit,
                 "offset": offset,
-                "total": len(records)
+                "total": len(records),
+                "next_cursor": next_cursor
             },
             "filters": {
                 "task_type": task_type,
@@ -770,7 +787,8 @@ async def run_full_task_range_async(
                     db=db,
                     task_id=main_task_id,
                     process_stage=f"数据抽取中 - 第{batch_num}/{total_batches}批",
-                    extracted_records=total_extracted
+                    extracted_records=total_extracted,
+                    buffered=True
                 )
                 
                 try:
@@ -955,7 +973,8 @@ async def run_full_task_range_async(
                         process_stage=f"分析第{cycle_num}/{total_cycles}轮",
                         success_records=total_successful,
                         failed_records=total_failed,
-                        analyzed_records=total_analyzed
+                        analyzed_records=total_analyzed,
+                        buffered=True
                     )
                     
                     logger.info(f"📈 第{cycle_num}/{total_cycles}轮完成: 成功{batch_successful}, 失败{batch_failed}, 分析{batch_analyzed}, 跳过{batch_skipped}")
@@ -1126,7 +1145,7 @@ async def stop_task(
         username = current_user.get("username", "unknown")
         
         # 检查任务是否存在
-        task = task_record.get_task_by_id(db, task_id)
+        task = task_record.get_task_summary(db, task_id)
         if not task:
             raise HTTPException(status_code=404, detail=f"任务不存在: {task_id}")
         
@@ -1178,7 +1197,7 @@ async def stop_tasks_batch(
         for task_id in task_ids:
             try:
                 # 检查任务是否存在
-                task = task_record.get_task_by_id(db, task_id)
+                task = task_record.get_task_summary(db, task_id)
                 if not task:
                     results.append({
                         "task_id": task_id,
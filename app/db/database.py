@@ -1,6 +1,9 @@
 """
 数据库连接和会话管理
 """
+import json
+
+import orjson
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
@@ -8,21 +11,49 @@ from sqlalchemy.pool import QueuePool
 
 from config.settings import settings
 
-# 创建数据库引擎 - 大幅增加连接池以支持高并发
+
+def _json_serializer(obj) -> str:
+    """JSON类型列的序列化器：优先orjson，无法处理的对象（如Decimal）回退到标准库"""
+    try:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+    except TypeError:
+        return json.dumps(obj, ensure_ascii=False, default=str)
+
+
+def _json_deserializer(value):
+    """JSON类型列的反序列化器：无法解析的内容保留原文为 {"raw": 原文}，不让单个坏值导致整个查询失败"""
+    try:
+        return orjson.loads(value)
+    except orjson.JSONDecodeError:
+        return {"raw": value}
+
+
+# 创建数据库引擎
+# 各处调用多为短会话（1~3条语句即归还），连接池无需过大：
+# 后台/API/分析线程合计几十个，25+25 足够且不会压垮MySQL
 engine = create_engine(
     settings.database_url,
     poolclass=QueuePool,
-    pool_size=30,        # 增加到30个基础连接
-    max_overflow=50,     # 增加到50个溢出连接，总计80个连接
+    pool_size=25,        # 基础连接数
+    max_overflow=25,     # 溢出连接数，总计50个连接
+    pool_use_lifo=True,  # 后进先出：优先复用刚归还的热连接，空闲的溢出连接能尽快被回收
     pool_pre_ping=True,
     pool_recycle=3600,
     pool_timeout=30,     # 添加连接超时
-    pool_reset_on_return='commit',  # 返回时重置连接状态
+    # 返回时重置连接状态；会话关闭时已结束事务的连接（含只读查询后的ROLLBACK）
+    # SQLAlchemy 2.0 不会再重复发送重置语句，只读路径每次请求只有一次事务结束往返
+    pool_reset_on_return='commit',
+    query_cache_size=1200,  # 编译语句缓存，容纳各模块预构建的固定SQL变体
+    insertmanyvalues_page_size=1000,  # 批量INSERT每条多行语句的行数上限
+    json_serializer=_json_serializer,  # JSON类型列的编解码走orjson
+    json_deserializer=_json_deserializer,
     echo=settings.log_sql_enabled,  # 根据配置决定是否显示SQL日志
     # 🔥 修复：添加明确的字符集配置
     connect_args={
         "charset": "utf8mb4",
-        "init_command": "SET NAMES utf8mb4 COLLATE utf8mb4_unicode_ci"
+        "init_command": "SET NAMES utf8mb4 COLLATE utf8mb4_unicode_ci",
+        # 仅在启用去噪记录 LOAD DATA 批量写入时允许客户端发送本地文件
+        "local_infile": settings.denoise_bulk_load_enabled
     }
 )
 
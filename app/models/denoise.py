@@ -2,42 +2,235 @@
 去噪记录数据模型
 用于管理内容去噪处理的记录和统计信息
 """
+import csv
 import json
 import logging
+import os
+import tempfile
 import uuid
-from datetime import datetime
-from typing import Dict, List, Optional, Any
-from sqlalchemy import text
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Dict, List, Optional, Any, ClassVar, Callable, Tuple, Iterator
+import orjson
+from sqlalchemy import text, TextClause
 from sqlalchemy.orm import Session
 
+from config.settings import settings
+
 logger = logging.getLogger(__name__)
 
 
+# 按精确类型分发的序列化处理器，避免对每个值依次做 isinstance 检查
+_JSON_HANDLERS: Dict[type, Callable[[Any], Any]] = {
+    datetime: datetime.isoformat,
+    # 将Decimal转换为float，保持数值精度（查询已在SQL中转为DOUBLE，此处仅作兜底）
+    Decimal: float,
+}
+
+
+def _json_default(obj: Any) -> Any:
+    """json/orjson 的 default 回调：处理datetime、Decimal等不可序列化的对象"""
+    handler = _JSON_HANDLERS.get(type(obj))
+    if handler is not None:
+        return handler(obj)
+    # 子类（如带时区扩展的datetime子类）走较慢的isinstance匹配
+    for base, handler in _JSON_HANDLERS.items():
+        if isinstance(obj, base):
+            return handler(obj)
+    raise TypeError(f"Type {type(obj)} not serializable")
+
+
 def safe_json_dumps(obj: Any, ensure_ascii: bool = False) -> str:
     """
     安全的JSON序列化函数，处理datetime、Decimal等不可序列化的对象
-    """
-    from decimal import Decimal
     
-    def json_serializer(obj):
-        if isinstance(obj, datetime):
-            return obj.isoformat()
-        elif isinstance(obj, Decimal):
-            # 将Decimal转换为float，保持数值精度
-            return float(obj)
-        raise TypeError(f"Type {type(obj)} not serializable")
+    输出格式与标准库 json.dumps 一致（", "/": " 分隔符、NaN/Infinity 原样输出），
+    已存储的数据和按长度截断的逻辑都依赖这一格式，因此不改用 orjson
+    """
+    return json.dumps(obj, ensure_ascii=ensure_ascii, default=_json_default)
+
+
+def json_column_bytes(obj: Any) -> bytes:
+    """
+    序列化为UTF-8 JSON字节，直接绑定到MySQL JSON列
     
-    return json.dumps(obj, ensure_ascii=ensure_ascii, default=json_serializer)
+    省去 str 构造和解码；SQL侧需写成 CONVERT(:param USING utf8mb4)，
+    否则MySQL会拒绝 binary 字符集的JSON值。目标列必须是 JSON 类型（不是 TEXT），
+    由MySQL在写入时完成校验
+    """
+    return orjson.dumps(obj, default=_json_default)
 
 
 class DenoiseRecordManager:
-    """去噪记录管理器"""
+    """
+    去噪记录管理器
+    
+    事务约定：一个批次（create_batch_record → 多次 save_work_order_denoise_record →
+    update_batch_statistics）在同一个事务内完成，只在 update_batch_statistics 结束时提交一次；
+    create_batch_record 与 save_work_order_denoise_record 不提交也不回滚，
+    中途出错时由调用方（编排者）负责 db.rollback()
+    """
+    
+    RECORDS_TABLE: ClassVar[str] = "ai_content_denoise_records"
+    BATCH_TABLE: ClassVar[str] = "ai_denoise_batch_statistics"
+    DENOISE_VERSION: ClassVar[str] = "v1.0"
+    # iter_work_order_denoise_records 使用服务端游标时每次拉取的行数
+    STREAM_CHUNK_SIZE: ClassVar[int] = 1000
     
-    def __init__(self):
-        """初始化管理器"""
-        self.records_table = "ai_content_denoise_records"
-        self.batch_table = "ai_denoise_batch_statistics"
-        self.denoise_version = "v1.0"
+    # 固定形状的写入语句在类定义时构建一次，避免每次调用重新格式化SQL和构造text()
+    _CREATE_BATCH_SQL: ClassVar[TextClause] = text(f"""
+        INSERT INTO {BATCH_TABLE} (
+            batch_id, total_work_orders, processed_work_orders,
+            total_original_comments, total_filtered_comments, total_removed_comments,
+            overall_filter_rate, processing_start_time, denoise_version, status
+        ) VALUES (
+            :batch_id, :total_work_orders, 0,
+            0, 0, 0,
+            0.00, :start_time, :version, 'PROCESSING'
+        )
+    """)
+    
+    _INSERT_RECORD_SQL: ClassVar[TextClause] = text(f"""
+        INSERT INTO {RECORDS_TABLE} (
+            work_id, batch_id, original_comment_count, filtered_comment_count,
+            removed_comment_count, filter_rate, filter_reasons, removed_details,
+            processing_time_ms, denoise_version
+        ) VALUES (
+            :work_id, :batch_id, :original_count, :filtered_count,
+            :removed_count, :filter_rate,
+            CONVERT(:filter_reasons USING utf8mb4), CONVERT(:removed_details USING utf8mb4),
+            :processing_time_ms, :version
+        )
+    """)
+    
+    # 批量插入时VALUES中只能是纯占位符，pymysql的executemany才会合并为单条多值INSERT，
+    # 因此JSON参数以str绑定，不使用CONVERT包装：批量路径仍要把orjson字节解码为str，
+    # 只得益于orjson更快的序列化，省不掉str这一步（LOAD DATA写CSV同样需要str）
+    _BULK_INSERT_RECORD_SQL: ClassVar[TextClause] = text(f"""
+        INSERT INTO {RECORDS_TABLE} (
+            work_id, batch_id, original_comment_count, filtered_comment_count,
+            removed_comment_count, filter_rate, filter_reasons, removed_details,
+            processing_time_ms, denoise_version
+        ) VALUES (
+            :work_id, :batch_id, :original_count, :filtered_count,
+            :removed_count, :filter_rate, :filter_reasons, :removed_details,
+            :processing_time_ms, :version
+        )
+    """)
+    
+    # LOAD DATA 导入的列顺序，与 _bulk_load_records 写出的CSV列一一对应
+    _BULK_LOAD_COLUMNS: ClassVar[Tuple[str, ...]] = (
+        "work_id", "batch_id", "original_comment_count", "filtered_comment_count",
+        "removed_comment_count", "filter_rate", "filter_reasons", "removed_details",
+        "processing_time_ms", "denoise_version"
+    )
+    _BULK_LOAD_PARAM_KEYS: ClassVar[Tuple[str, ...]] = (
+        "work_id", "batch_id", "original_count", "filtered_count",
+        "removed_count", "filter_rate", "filter_reasons", "removed_details",
+        "processing_time_ms", "version"
+    )
+    
+    _UPDATE_BATCH_SQL: ClassVar[TextClause] = text(f"""
+        UPDATE {BATCH_TABLE}
+        SET 
+            processed_work_orders = :processed_orders,
+            total_original_comments = :original_comments,
+            total_filtered_comments = :filtered_comments,
+            total_removed_comments = :removed_comments,
+            overall_filter_rate = :filter_rate,
+            global_filter_reasons = CONVERT(:filter_reasons USING utf8mb4),
+            processing_end_time = :end_time,
+            total_processing_time_ms = :processing_time_ms,
+            status = :status,
+            error_message = :error_message,
+            updated_at = :updated_at
+        WHERE batch_id = :batch_id
+    """)
+    
+    # 只写一次性字段的收尾语句：批次没有任何处理数据时，数值列保持创建时的0，无需重写
+    _FINISH_BATCH_SQL: ClassVar[TextClause] = text(f"""
+        UPDATE {BATCH_TABLE}
+        SET 
+            processing_end_time = :end_time,
+            total_processing_time_ms = :processing_time_ms,
+            status = :status,
+            error_message = :error_message,
+            updated_at = :updated_at
+        WHERE batch_id = :batch_id
+    """)
+    
+    # 批次统计中需要聚合写入的字段，全部为空/0时走 _FINISH_BATCH_SQL
+    _AGGREGATED_STAT_KEYS: ClassVar[Tuple[str, ...]] = (
+        "total_work_orders", "total_original_comments", "total_filtered_comments",
+        "total_removed_comments", "filter_reasons"
+    )
+    
+    # DECIMAL列在SQL中CAST为DOUBLE，驱动直接返回float，省去逐行Decimal→float转换
+    # 批次聚合与记录聚合各自在CTE中计算，单行返回
+    _SUMMARY_SQL: ClassVar[TextClause] = text(f"""
+        WITH b AS (
+            SELECT 
+                COUNT(*) as total_batches,
+                SUM(total_work_orders) as total_work_orders,
+                SUM(total_original_comments) as total_original_comments,
+                SUM(total_filtered_comments) as total_filtered_comments,
+                SUM(total_removed_comments) as total_removed_comments,
+                CAST(AVG(overall_filter_rate) AS DOUBLE) as avg_filter_rate
+            FROM {BATCH_TABLE}
+            WHERE created_at >= :start_date
+            AND status = 'COMPLETED'
+        ), r AS (
+            SELECT 
+                COUNT(*) as total_records,
+                CAST(AVG(filter_rate) AS DOUBLE) as avg_work_order_filter_rate,
+                CAST(MAX(filter_rate) AS DOUBLE) as max_filter_rate,
+                CAST(MIN(filter_rate) AS DOUBLE) as min_filter_rate
+            FROM {RECORDS_TABLE}
+            WHERE created_at >= :start_date
+        )
+        SELECT b.*, r.* FROM b CROSS JOIN r
+    """)
+    
+    _REASONS_SQL: ClassVar[TextClause] = text(f"""
+        SELECT filter_reasons
+        FROM {RECORDS_TABLE}
+        WHERE created_at >= :start_date
+        AND filter_reasons IS NOT NULL
+    """)
+    
+    # 可选过滤条件预先展开为固定语句，每种组合只占用一个编译缓存槽位，不在调用时拼接SQL
+    _BATCH_STATS_SELECT: ClassVar[str] = f"""
+        SELECT 
+            id, batch_id, total_work_orders, processed_work_orders,
+            total_original_comments, total_filtered_comments, total_removed_comments,
+            CAST(overall_filter_rate AS DOUBLE) AS overall_filter_rate, global_filter_reasons,
+            processing_start_time, processing_end_time, total_processing_time_ms,
+            denoise_version, status, error_message, created_at
+        FROM {BATCH_TABLE}
+    """
+    _BATCH_STATS_SQL: ClassVar[TextClause] = text(
+        _BATCH_STATS_SELECT + " ORDER BY created_at DESC LIMIT :limit"
+    )
+    _BATCH_STATS_BY_ID_SQL: ClassVar[TextClause] = text(
+        _BATCH_STATS_SELECT + " WHERE batch_id = :batch_id ORDER BY created_at DESC LIMIT :limit"
+    )
+    
+    _RECORDS_SELECT: ClassVar[str] = f"""
+        SELECT 
+            id, work_id, batch_id, original_comment_count, filtered_comment_count,
+            removed_comment_count, CAST(filter_rate AS DOUBLE) AS filter_rate, filter_reasons, removed_details,
+            processing_time_ms, denoise_version, created_at
+        FROM {RECORDS_TABLE}
+    """
+    # 键为 (是否按work_id过滤, 是否按batch_id过滤)
+    _RECORDS_SQLS: ClassVar[Dict[Tuple[bool, bool], TextClause]] = {
+        (False, False): text(_RECORDS_SELECT + " ORDER BY created_at DESC LIMIT :limit"),
+        (True, False): text(_RECORDS_SELECT + " WHERE work_id = :work_id ORDER BY created_at DESC LIMIT :limit"),
+        (False, True): text(_RECORDS_SELECT + " WHERE batch_id = :batch_id ORDER BY created_at DESC LIMIT :limit"),
+        (True, True): text(
+            _RECORDS_SELECT + " WHERE work_id = :work_id AND batch_id = :batch_id ORDER BY created_at DESC LIMIT :limit"
+        ),
+    }
     
     def generate_batch_id(self) -> str:
         """生成批次ID"""
@@ -51,36 +244,64 @@ class DenoiseRecordManager:
         batch_id: str,
         total_work_orders: int
     ) -> bool:
-        """创建批次记录"""
+        """创建批次记录（不提交，随批次统计更新一起提交）"""
         try:
-            sql = f"""
-            INSERT INTO {self.batch_table} (
-                batch_id, total_work_orders, processed_work_orders,
-                total_original_comments, total_filtered_comments, total_removed_comments,
-                overall_filter_rate, processing_start_time, denoise_version, status
-            ) VALUES (
-                :batch_id, :total_work_orders, 0,
-                0, 0, 0,
-                0.00, :start_time, :version, 'PROCESSING'
-            )
-            """
-            
-            db.execute(text(sql), {
+            db.execute(self._CREATE_BATCH_SQL, {
                 "batch_id": batch_id,
                 "total_work_orders": total_work_orders,
                 "start_time": datetime.now(),
-                "version": self.denoise_version
+                "version": self.DENOISE_VERSION
             })
-            db.commit()
             
             logger.info(f"✅ 创建批次记录: {batch_id}, 工单数: {total_work_orders}")
             return True
             
         except Exception as e:
             logger.error(f"❌ 创建批次记录失败: {e}")
-            db.rollback()
             return False
     
+    def _build_record_params(
+        self,
+        work_id: int,
+        batch_id: str,
+        denoise_result: Dict[str, Any],
+        processing_time_ms: Optional[int] = None,
+        json_as_text: bool = False
+    ) -> Dict[str, Any]:
+        """
+        构建单条工单去噪记录的插入参数
+        
+        JSON字段默认以UTF-8字节返回，配合SQL中的 CONVERT(... USING utf8mb4) 绑定；
+        json_as_text 为 True 时解码为str，供不能使用CONVERT的批量插入和LOAD DATA使用
+        """
+        # 计算过滤率
+        original_count = denoise_result.get("original_count", 0)
+        removed_count = denoise_result.get("removed_count", 0)
+        filter_rate = (removed_count / original_count * 100) if original_count > 0 else 0.0
+        
+        # 提取过滤原因和详细信息
+        filter_statistics = denoise_result.get("filter_statistics", {})
+        filter_reasons = filter_statistics.get("filter_reasons", {})
+        removed_details = filter_statistics.get("removed_details", [])
+        filter_reasons_json = json_column_bytes(filter_reasons) if filter_reasons else None
+        removed_details_json = json_column_bytes(removed_details) if removed_details else None
+        if json_as_text:
+            filter_reasons_json = filter_reasons_json and filter_reasons_json.decode()
+            removed_details_json = removed_details_json and removed_details_json.decode()
+        
+        return {
+            "work_id": work_id,
+            "batch_id": batch_id,
+            "original_count": original_count,
+            "filtered_count": denoise_result.get("filtered_count", 0),
+            "removed_count": removed_count,
+            "filter_rate": round(filter_rate, 2),
+            "filter_reasons": filter_reasons_json,
+            "removed_details": removed_details_json,
+            "processing_time_ms": processing_time_ms,
+            "version": self.DENOISE_VERSION
+        }
+    
     def save_work_order_denoise_record(
         self,
         db: Session,
@@ -91,100 +312,149 @@ class DenoiseRecordManager:
     ) -> bool:
         """保存单个工单的去噪记录"""
         try:
-            # 计算过滤率
-            original_count = denoise_result.get("original_count", 0)
-            filtered_count = denoise_result.get("filtered_count", 0)
-            removed_count = denoise_result.get("removed_count", 0)
-            filter_rate = (removed_count / original_count * 100) if original_count > 0 else 0.0
+            params = self._build_record_params(work_id, batch_id, denoise_result, processing_time_ms)
+            db.execute(self._INSERT_RECORD_SQL, params)
             
-            # 提取过滤原因和详细信息
-            filter_statistics = denoise_result.get("filter_statistics", {})
-            filter_reasons = filter_statistics.get("filter_reasons", {})
-            removed_details = filter_statistics.get("removed_details", [])
-            
-            sql = f"""
-            INSERT INTO {self.records_table} (
-                work_id, batch_id, original_comment_count, filtered_comment_count,
-                removed_comment_count, filter_rate, filter_reasons, removed_details,
-                processing_time_ms, denoise_version
-            ) VALUES (
-                :work_id, :batch_id, :original_count, :filtered_count,
-                :removed_count, :filter_rate, :filter_reasons, :removed_details,
-                :processing_time_ms, :version
-            )
-            """
-            
-            db.execute(text(sql), {
-                "work_id": work_id,
-                "batch_id": batch_id,
-                "original_count": original_count,
-                "filtered_count": filtered_count,
-                "removed_count": removed_count,
-                "filter_rate": round(filter_rate, 2),
-                "filter_reasons": safe_json_dumps(filter_reasons, ensure_ascii=False) if filter_reasons else None,
-                "removed_details": safe_json_dumps(removed_details, ensure_ascii=False) if removed_details else None,
-                "processing_time_ms": processing_time_ms,
-                "version": self.denoise_version
-            })
-            
-            logger.debug(f"📋 保存工单 {work_id} 去噪记录: {original_count} -> {filtered_count}")
+            logger.debug(f"📋 保存工单 {work_id} 去噪记录: {params['original_count']} -> {params['filtered_count']}")
             return True
             
         except Exception as e:
             logger.error(f"❌ 保存工单 {work_id} 去噪记录失败: {e}")
             return False
     
+    def save_work_order_denoise_records(
+        self,
+        db: Session,
+        batch_id: str,
+        denoise_results: List[Tuple[int, Dict[str, Any]]]
+    ) -> bool:
+        """
+        批量保存工单去噪记录
+        
+        所有参数一次构建后以 executemany 方式提交给驱动（pymysql 会合并为多值INSERT），
+        与单条保存一样不提交事务
+        
+        Args:
+            db: 数据库会话
+            batch_id: 批次ID
+            denoise_results: (work_id, 去噪结果) 列表
+        """
+        if not denoise_results:
+            return True
+        
+        try:
+            params_list = [
+                self._build_record_params(work_id, batch_id, denoise_result, json_as_text=True)
+                for work_id, denoise_result in denoise_results
+            ]
+            if settings.denoise_bulk_load_enabled and len(params_list) >= settings.denoise_bulk_load_threshold:
+                self._bulk_load_records(db, params_list)
+            else:
+                db.execute(self._BULK_INSERT_RECORD_SQL, params_list)
+            
+            logger.debug(f"📋 批量保存 {len(params_list)} 条工单去噪记录，批次: {batch_id}")
+            return True
+            
+        except Exception as e:
+            logger.error(f"❌ 批量保存工单去噪记录失败，批次: {batch_id}, 错误: {e}")
+            return False
+    
+    def _bulk_load_records(self, db: Session, params_list: List[Dict[str, Any]]) -> None:
+        """
+        通过 LOAD DATA LOCAL INFILE 导入超大批次的去噪记录
+        
+        先写临时CSV文件，再在会话当前连接上执行导入，仍处于批次事务内；
+        NULL 以未加引号的 NULL 写出（ESCAPED BY '' 时MySQL按NULL解析）
+        """
+        csv_file = tempfile.NamedTemporaryFile(
+            "w", suffix=".csv", newline="", encoding="utf-8", delete=False
+        )
+        csv_path = csv_file.name
+        
+        # 写文件和导入都在 try 内，任一步失败都会删除临时文件
+        try:
+            with csv_file:
+                writer = csv.writer(csv_file, lineterminator="\n")
+                for params in params_list:
+                    writer.writerow([
+                        "NULL" if params[key] is None else params[key]
+                        for key in self._BULK_LOAD_PARAM_KEYS
+                    ])
+            
+            load_sql = f"""
+            LOAD DATA LOCAL INFILE %s
+            INTO TABLE {self.RECORDS_TABLE}
+            CHARACTER SET utf8mb4
+            FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '"' ESCAPED BY ''
+            LINES TERMINATED BY '\\n'
+            ({", ".join(self._BULK_LOAD_COLUMNS)})
+            """
+            cursor = db.connection().connection.cursor()
+            try:
+                cursor.execute(load_sql, (csv_path,))
+            finally:
+                cursor.close()
+            logger.info(f"📦 LOAD DATA 导入 {len(params_list)} 条工单去噪记录")
+        finally:
+            os.unlink(csv_path)
+    
     def update_batch_statistics(
         self,
         db: Session,
         batch_id: str,
         statistics: Dict[str, Any],
         status: str = "COMPLETED",
-        error_message: Optional[str] = None
+        error_message: Optional[str] = None,
+        commit: bool = True
     ) -> bool:
-        """更新批次统计信息"""
+        """
+        更新批次统计信息，并提交整个批次事务
+        
+        commit=False 时只执行更新，失败时也不回滚，由调用方（如在保存点内写入时）决定提交或回滚
+        """
         try:
             processing_time_ms = statistics.get("total_processing_time_ms")
-            
-            sql = f"""
-            UPDATE {self.batch_table}
-            SET 
-                processed_work_orders = :processed_orders,
-                total_original_comments = :original_comments,
-                total_filtered_comments = :filtered_comments,
-                total_removed_comments = :removed_comments,
-                overall_filter_rate = :filter_rate,
-                global_filter_reasons = :filter_reasons,
-                processing_end_time = :end_time,
-                total_processing_time_ms = :processing_time_ms,
-                status = :status,
-                error_message = :error_message,
-                updated_at = :updated_at
-            WHERE batch_id = :batch_id
-            """
-            
-            db.execute(text(sql), {
+            now = datetime.now()
+            
+            if not any(statistics.get(key) for key in self._AGGREGATED_STAT_KEYS):
+                # 没有处理任何数据（如提前失败）：只收尾状态字段，仍需提交批次事务
+                db.execute(self._FINISH_BATCH_SQL, {
+                    "batch_id": batch_id,
+                    "end_time": now,
+                    "processing_time_ms": processing_time_ms,
+                    "status": status,
+                    "error_message": error_message,
+                    "updated_at": now
+                })
+                if commit:
+                    db.commit()
+                logger.info(f"✅ 更新批次状态: {batch_id}, 状态: {status}（无处理数据）")
+                return True
+            
+            db.execute(self._UPDATE_BATCH_SQL, {
                 "batch_id": batch_id,
                 "processed_orders": statistics.get("total_work_orders", 0),
                 "original_comments": statistics.get("total_original_comments", 0),
                 "filtered_comments": statistics.get("total_filtered_comments", 0),
                 "removed_comments": statistics.get("total_removed_comments", 0),
                 "filter_rate": round(statistics.get("overall_filter_rate", 0.0), 2),
-                "filter_reasons": safe_json_dumps(statistics.get("filter_reasons", {}), ensure_ascii=False),
-                "end_time": datetime.now(),
+                "filter_reasons": json_column_bytes(statistics.get("filter_reasons", {})),
+                "end_time": now,
                 "processing_time_ms": processing_time_ms,
                 "status": status,
                 "error_message": error_message,
-                "updated_at": datetime.now()
+                "updated_at": now
             })
-            db.commit()
+            if commit:
+                db.commit()
             
             logger.info(f"✅ 更新批次统计: {batch_id}, 状态: {status}")
             return True
             
         except Exception as e:
             logger.error(f"❌ 更新批次统计失败: {e}")
-            db.rollback()
+            if commit:
+                db.rollback()
             return False
     
     def get_batch_statistics(
@@ -195,26 +465,10 @@ class DenoiseRecordManager:
     ) -> List[Dict[str, Any]]:
         """获取批次统计信息"""
         try:
-            where_clause = "WHERE batch_id = :batch_id" if batch_id else ""
-            
-            sql = f"""
-            SELECT 
-                id, batch_id, total_work_orders, processed_work_orders,
-                total_original_comments, total_filtered_comments, total_removed_comments,
-                overall_filter_rate, global_filter_reasons,
-                processing_start_time, processing_end_time, total_processing_time_ms,
-                denoise_version, status, error_message, created_at
-            FROM {self.batch_table}
-            {where_clause}
-            ORDER BY created_at DESC
-            LIMIT :limit
-            """
-            
-            params = {"limit": limit}
             if batch_id:
-                params["batch_id"] = batch_id
-            
-            result = db.execute(text(sql), params)
+                result = db.execute(self._BATCH_STATS_BY_ID_SQL, {"batch_id": batch_id, "limit": limit})
+            else:
+                result = db.execute(self._BATCH_STATS_SQL, {"limit": limit})
             
             statistics = []
             for row in result:
@@ -226,7 +480,7 @@ class DenoiseRecordManager:
                     "total_original_comments": row.total_original_comments,
                     "total_filtered_comments": row.total_filtered_comments,
                     "total_removed_comments": row.total_removed_comments,
-                    "overall_filter_rate": float(row.overall_filter_rate),
+                    "overall_filter_rate": row.overall_filter_rate,
                     "global_filter_reasons": json.loads(row.global_filter_reasons) if row.global_filter_reasons else {},
                     "processing_start_time": row.processing_start_time,
                     "processing_end_time": row.processing_end_time,
@@ -254,49 +508,9 @@ class DenoiseRecordManager:
     ) -> List[Dict[str, Any]]:
         """获取工单去噪记录"""
         try:
-            where_conditions = []
-            params = {"limit": limit}
-            
-            if work_id:
-                where_conditions.append("work_id = :work_id")
-                params["work_id"] = work_id
-            
-            if batch_id:
-                where_conditions.append("batch_id = :batch_id")
-                params["batch_id"] = batch_id
-            
-            where_clause = "WHERE " + " AND ".join(where_conditions) if where_conditions else ""
-            
-            sql = f"""
-            SELECT 
-                id, work_id, batch_id, original_comment_count, filtered_comment_count,
-                removed_comment_count, filter_rate, filter_reasons, removed_details,
-                processing_time_ms, denoise_version, created_at
-            FROM {self.records_table}
-            {where_clause}
-            ORDER BY created_at DESC
-            LIMIT :limit
-            """
-            
-            result = db.execute(text(sql), params)
-            
-            records = []
-            for row in result:
-                record = {
-                    "id": row.id,
-                    "work_id": row.work_id,
-                    "batch_id": row.batch_id,
-                    "original_comment_count": row.original_comment_count,
-                    "filtered_comment_count": row.filtered_comment_count,
-                    "removed_comment_count": row.removed_comment_count,
-                    "filter_rate": float(row.filter_rate),
-                    "filter_reasons": json.loads(row.filter_reasons) if row.filter_reasons else {},
-                    "removed_details": json.loads(row.removed_details) if row.removed_details else [],
-                    "processing_time_ms": row.processing_time_ms,
-                    "denoise_version": row.denoise_version,
-                    "created_at": row.created_at
-                }
-                records.append(record)
+            sql, params = self._build_records_query(work_id, batch_id, limit)
+            # 结果本就要整体返回，一次取回即可；服务端游标只留给 iter_work_order_denoise_records
+            records = [self._format_denoise_record(row) for row in db.execute(sql, params)]
             
             logger.info(f"📋 获取到 {len(records)} 条工单去噪记录")
             return records
@@ -305,52 +519,73 @@ class DenoiseRecordManager:
             logger.error(f"❌ 获取工单去噪记录失败: {e}")
             return []
     
+    def iter_work_order_denoise_records(
+        self,
+        db: Session,
+        work_id: Optional[int] = None,
+        batch_id: Optional[str] = None,
+        limit: int = 100
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        逐条产出工单去噪记录（参数同 get_work_order_denoise_records）
+        
+        使用服务端游标按 STREAM_CHUNK_SIZE 分块拉取，大 limit 导出时内存占用有界；
+        迭代结束前该会话的连接被结果集占用，不能穿插其他查询。异常直接抛给调用方
+        """
+        sql, params = self._build_records_query(work_id, batch_id, limit)
+        result = db.execute(
+            sql, params,
+            execution_options={"stream_results": True, "yield_per": self.STREAM_CHUNK_SIZE}
+        )
+        
+        for row in result:
+            yield self._format_denoise_record(row)
+    
+    def _build_records_query(
+        self,
+        work_id: Optional[int],
+        batch_id: Optional[str],
+        limit: int
+    ) -> Tuple[TextClause, Dict[str, Any]]:
+        """按过滤条件选取预构建的记录查询语句及其参数"""
+        params: Dict[str, Any] = {"limit": limit}
+        if work_id:
+            params["work_id"] = work_id
+        if batch_id:
+            params["batch_id"] = batch_id
+        return self._RECORDS_SQLS[(bool(work_id), bool(batch_id))], params
+    
+    def _format_denoise_record(self, row) -> Dict[str, Any]:
+        """格式化单条工单去噪记录"""
+        return {
+            "id": row.id,
+            "work_id": row.work_id,
+            "batch_id": row.batch_id,
+            "original_comment_count": row.original_comment_count,
+            "filtered_comment_count": row.filtered_comment_count,
+            "removed_comment_count": row.removed_comment_count,
+            "filter_rate": row.filter_rate,
+            "filter_reasons": json.loads(row.filter_reasons) if row.filter_reasons else {},
+            "removed_details": json.loads(row.removed_details) if row.removed_details else [],
+            "processing_time_ms": row.processing_time_ms,
+            "denoise_version": row.denoise_version,
+            "created_at": row.created_at
+        }
+    
     def get_denoise_summary(self, db: Session, days: int = 7) -> Dict[str, Any]:
         """获取去噪统计摘要"""
         try:
             # 计算时间范围
+            # 用timedelta回推，跨月时不会越界；起点截断到零点，created_at >= :start_date 可走索引范围扫描
             end_date = datetime.now()
-            start_date = end_date.replace(hour=0, minute=0, second=0, microsecond=0)
-            start_date = start_date.replace(day=start_date.day - days + 1)
+            start_date = (end_date - timedelta(days=days - 1)).replace(hour=0, minute=0, second=0, microsecond=0)
             
-            # 批次统计
-            batch_sql = f"""
-            SELECT 
-                COUNT(*) as total_batches,
-                SUM(total_work_orders) as total_work_orders,
-                SUM(total_original_comments) as total_original_comments,
-                SUM(total_filtered_comments) as total_filtered_comments,
-                SUM(total_removed_comments) as total_removed_comments,
-                AVG(overall_filter_rate) as avg_filter_rate
-            FROM {self.batch_table}
-            WHERE created_at >= :start_date
-            AND status = 'COMPLETED'
-            """
-            
-            batch_result = db.execute(text(batch_sql), {"start_date": start_date}).fetchone()
-            
-            # 工单记录统计
-            record_sql = f"""
-            SELECT 
-                COUNT(*) as total_records,
-                AVG(filter_rate) as avg_work_order_filter_rate,
-                MAX(filter_rate) as max_filter_rate,
-                MIN(filter_rate) as min_filter_rate
-            FROM {self.records_table}
-            WHERE created_at >= :start_date
-            """
-            
-            record_result = db.execute(text(record_sql), {"start_date": start_date}).fetchone()
+            # 批次统计与工单记录统计合并为一次往返
+            summary_row = db.execute(self._SUMMARY_SQL, {"start_date": start_date}).fetchone()
+            batch_result = record_result = summary_row
             
             # 热门过滤原因统计
-            reasons_sql = f"""
-            SELECT filter_reasons
-            FROM {self.records_table}
-            WHERE created_at >= :start_date
-            AND filter_reasons IS NOT NULL
-            """
-            
-            reasons_result = db.execute(text(reasons_sql), {"start_date": start_date})
+            reasons_result = db.execute(self._REASONS_SQL, {"start_date": start_date})
             
             # 聚合过滤原因
             all_reasons = {}
@@ -375,13 +610,13 @@ class DenoiseRecordManager:
                     "total_original_comments": batch_result.total_original_comments or 0,
                     "total_filtered_comments": batch_result.total_filtered_comments or 0,
                     "total_removed_comments": batch_result.total_removed_comments or 0,
-                    "avg_filter_rate": round(float(batch_result.avg_filter_rate or 0), 2)
+                    "avg_filter_rate": round(batch_result.avg_filter_rate or 0, 2)
                 },
                 "record_statistics": {
                     "total_records": record_result.total_records or 0,
-                    "avg_work_order_filter_rate": round(float(record_result.avg_work_order_filter_rate or 0), 2),
-                    "max_filter_rate": round(float(record_result.max_filter_rate or 0), 2),
-                    "min_filter_rate": round(float(record_result.min_filter_rate or 0), 2)
+                    "avg_work_order_filter_rate": round(record_result.avg_work_order_filter_rate or 0, 2),
+                    "max_filter_rate": round(record_result.max_filter_rate or 0, 2),
+                    "min_filter_rate": round(record_result.min_filter_rate or 0, 2)
                 },
                 "top_filter_reasons": [{"reason": reason, "count": count} for reason, count in top_reasons]
             }
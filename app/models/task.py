@@ -1,28 +1,227 @@
 """
 任务执行记录数据模型
 """
-import json
-import uuid
+import itertools
+import os
+import threading
+import time
 from datetime import datetime
-from typing import Dict, Any, Optional, List
-from sqlalchemy import text
+from typing import Dict, Any, Optional, List, Tuple, FrozenSet, ClassVar, Iterator
+from sqlalchemy import (
+    MetaData, Table, Column, BigInteger, Integer, String, Text, DateTime, JSON,
+    Insert, Select, Update, TextClause,
+    insert, update, select, bindparam, func, literal, literal_column, and_, or_, case, text
+)
 from sqlalchemy.orm import Session
 
+from app.db.connection_manager import get_db_session
+
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+# 表结构由 sql/ 下的迁移脚本维护，这里使用独立的 MetaData，不参与 create_tables()
+# JSON列由驱动层按类型编解码（引擎配置了orjson序列化器），读写两侧都直接使用dict；
+# none_as_null 保证未提供的详情写入SQL NULL而不是JSON 'null'
+ai_task_execution_records = Table(
+    "ai_task_execution_records",
+    MetaData(),
+    Column("id", BigInteger, primary_key=True, autoincrement=True),
+    Column("task_id", String(64), nullable=False, unique=True),
+    Column("task_name", String(100), nullable=False),
+    Column("task_type", String(50), nullable=False),
+    Column("task_config_key", String(100)),
+    Column("trigger_type", String(20), nullable=False),
+    Column("trigger_user", String(50)),
+    Column("start_time", DateTime, nullable=False),
+    Column("end_time", DateTime),
+    Column("duration_seconds", Integer),
+    Column("status", String(20), nullable=False),
+    Column("process_stage", String(50)),
+    Column("total_records", Integer),
+    Column("processed_records", Integer),
+    Column("success_records", Integer),
+    Column("failed_records", Integer),
+    Column("skipped_records", Integer),
+    Column("denoised_records", Integer),
+    Column("duplicate_records", Integer),
+    Column("extracted_records", Integer),
+    Column("analyzed_records", Integer),
+    Column("batch_size", Integer),
+    Column("max_concurrent", Integer),
+    Column("error_message", Text),
+    Column("execution_details", JSON(none_as_null=True)),
+    Column("performance_stats", JSON(none_as_null=True)),
+    Column("created_at", DateTime, nullable=False, server_default=func.current_timestamp()),
+    Column("updated_at", DateTime, nullable=False, server_default=func.current_timestamp()),
+)
+
+
+# 任务ID序号；起点随机，避免多实例（容器内进程号可能相同）在同一秒生成相同ID
+_task_id_seq = itertools.count(int.from_bytes(os.urandom(3), "big"))
+
+
+def _build_derived_columns(t: Table) -> List[Any]:
+    """
+    在SQL中计算的派生列：跳过数、总处理数与三个比率
+    
+    列表接口每行都要算这些值，放进SELECT后Python侧只剩取值与round
+    """
+    success = func.coalesce(t.c.success_records, 0)
+    failed = func.coalesce(t.c.failed_records, 0)
+    skipped = func.coalesce(t.c.skipped_records, 0)
+    # 实际执行过的记录数（成功+失败，不包括跳过）
+    actual_processed = success + failed
+    
+    # 兼容旧数据：没有跳过记录数据时从总数中推算
+    effective_skipped = case(
+        (and_(skipped == 0, t.c.total_records > actual_processed), t.c.total_records - actual_processed),
+        else_=skipped
+    )
+    # 🔥 优先使用 processed_records（API层正确维护的值），缺失时按 实际处理+跳过 计算
+    total_processed = func.coalesce(t.c.processed_records, actual_processed + effective_skipped)
+    
+    # 总体完成率（包括跳过，不超过100%）；抽取阶段尚无实际处理时为0，总数为0视为已完成
+    in_extraction = or_(t.c.process_stage.like("%抽取%"), t.c.process_stage.like("%开始分析%"))
+    completion_rate = case(
+        (t.c.total_records > 0, case(
+            (and_(in_extraction, actual_processed == 0), 0),
+            else_=func.least(total_processed, t.c.total_records) * 100.0 / t.c.total_records
+        )),
+        (t.c.total_records == 0, 100),
+        else_=0
+    )
+    # 实际处理完成率（不包括跳过）
+    actual_completion_rate = case(
+        (t.c.total_records > 0, actual_processed * 100.0 / t.c.total_records),
+        else_=0
+    )
+    # 成功率（基于实际处理的记录）
+    success_rate = case(
+        (actual_processed > 0, success * 100.0 / actual_processed),
+        else_=0
+    )
+    
+    return [
+        effective_skipped.label("skipped_records"),
+        total_processed.label("processed_records"),
+        completion_rate.label("completion_rate"),
+        actual_completion_rate.label("actual_completion_rate"),
+        success_rate.label("success_rate"),
+    ]
+
+
 class TaskExecutionRecord:
-    """任务执行记录模型"""
+    """
+    任务执行记录模型
+    
+    全局单例 task_record 可被多线程共享：读写方法使用调用方传入的会话，
+    缓冲进度的刷新使用独立会话，实例上除受锁保护的进度缓冲外没有可变的连接状态
+    """
+    
+    table: ClassVar[Table] = ai_task_execution_records
+    TABLE_NAME: ClassVar[str] = ai_task_execution_records.name
+    
+    # UPDATE 语句定位任务所用的参数名；不能与列名 task_id 相同，否则会被当作 SET 的值
+    TASK_ID_PARAM: ClassVar[str] = "target_task_id"
+    
+    # 格式化所需的全部列：原始列（跳过数、处理数由派生列替代）+ SQL计算的派生列
+    _RECORD_COLUMNS: ClassVar[List[Any]] = [
+        c for c in ai_task_execution_records.c
+        if c.name not in ("skipped_records", "processed_records")
+    ] + _build_derived_columns(ai_task_execution_records)
+    
+    # 不含两个JSON大字段，状态检查等轻量场景使用
+    _SUMMARY_COLUMNS: ClassVar[List[Any]] = [
+        c for c in _RECORD_COLUMNS
+        if c.name not in ("execution_details", "performance_stats")
+    ]
+    
+    _GET_RECORD_STMT: ClassVar[Select] = select(*_RECORD_COLUMNS).where(
+        ai_task_execution_records.c.task_id == bindparam("task_id")
+    )
+    
+    _GET_SUMMARY_STMT: ClassVar[Select] = select(*_SUMMARY_COLUMNS).where(
+        ai_task_execution_records.c.task_id == bindparam("task_id")
+    )
+    
+    # MySQL 的 GROUP BY ... WITH ROLLUP 无法用 Core 表达，保留为文本SQL
+    _STATISTICS_SQL: ClassVar[TextClause] = text(f"""
+        SELECT task_type, status,
+               GROUPING(task_type) AS type_rollup,
+               GROUPING(status) AS status_rollup,
+               COUNT(*) AS task_count,
+               AVG(duration_seconds) AS avg_duration,
+               SUM(success_records) AS total_success,
+               SUM(failed_records) AS total_failed
+        FROM {TABLE_NAME}
+        WHERE start_time >= DATE_SUB(NOW(), INTERVAL :days DAY)
+        GROUP BY task_type, status WITH ROLLUP
+    """)
+    
+    _RECENT_TASKS_STMT: ClassVar[Select] = (
+        select(
+            ai_task_execution_records.c.task_id,
+            ai_task_execution_records.c.task_name,
+            ai_task_execution_records.c.status,
+            ai_task_execution_records.c.start_time,
+            ai_task_execution_records.c.duration_seconds,
+        )
+        .order_by(ai_task_execution_records.c.start_time.desc())
+        .limit(10)
+    )
+    
+    # 分批删除：MySQL 的 DELETE ... ORDER BY ... LIMIT 无法用 Core 表达，保留为文本SQL；
+    # ORDER BY start_time 使删除沿 idx_start_time 范围推进
+    CLEANUP_BATCH_SIZE: ClassVar[int] = 5000
+    _CLEANUP_SQL: ClassVar[TextClause] = text(f"""
+        DELETE FROM {TABLE_NAME}
+        WHERE start_time < DATE_SUB(NOW(), INTERVAL :days_to_keep DAY)
+        AND status IN ('completed', 'failed', 'cancelled')
+        ORDER BY start_time
+        LIMIT :batch_size
+    """)
+    
+    # update_task_progress 可选字段，顺序与方法参数一致
+    _PROGRESS_FIELDS: ClassVar[Tuple[str, ...]] = (
+        "status", "process_stage", "total_records", "processed_records", "success_records",
+        "failed_records", "skipped_records", "denoised_records", "duplicate_records",
+        "extracted_records", "analyzed_records", "execution_details", "performance_stats",
+    )
+    
+    # 缓冲进度更新的刷新间隔（秒）
+    PROGRESS_FLUSH_INTERVAL = 0.5
+    
+    # 不带 .values()，按参数键生成列
+    _CREATE_STMT: ClassVar[Insert] = insert(ai_task_execution_records)
+    
+    # 按SET字段集合缓存的UPDATE语句；可选字段理论组合很多，实际反复出现的只有少数几种
+    _update_stmt_cache: ClassVar[Dict[Tuple[FrozenSet[str], bool], Update]] = {}
+    
+    # 完成任务时在数据库端按 start_time 计算耗时，省去先查开始时间的一次往返
+    _DURATION_EXPR: ClassVar[Any] = func.timestampdiff(
+        literal_column("SECOND"), ai_task_execution_records.c.start_time, bindparam("end_time")
+    )
     
     def __init__(self):
-        self.table_name = "ai_task_execution_records"
+        # 缓冲的进度更新：task_id -> 待写入的最新字段值
+        self._pending_progress: Dict[str, Dict[str, Any]] = {}
+        self._pending_lock = threading.Lock()
+        # 串行化各次刷新，保证先取出的旧进度先写入；同步写入路径不持有此锁
+        self._flush_lock = threading.Lock()
+        self._flush_timer: Optional[threading.Timer] = None
+        # 正在写库的刷新批次包含的任务ID，及该次刷新结束时置位的事件（均由 _pending_lock 保护）
+        self._flushing_ids: FrozenSet[str] = frozenset()
+        self._flush_done = threading.Event()
+        self._flush_done.set()
     
     def generate_task_id(self, task_type: str, trigger_type: str = "scheduled") -> str:
         """生成任务ID"""
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        unique_id = str(uuid.uuid4())[:8]
+        timestamp = time.strftime('%Y%m%d_%H%M%S')
+        # 完整进程号 + 5位自增序号（均为十六进制）：序号定宽，同一主机上不同进程的ID不会相同；
+        # 进程号按实际位数输出，总长度仍远小于 task_id 列的64个字符
+        unique_id = f"{os.getpid():x}{next(_task_id_seq) & 0xFFFFF:05x}"
         prefix = "MANUAL" if trigger_type == "manual" else "SCHED"
         return f"{prefix}_{task_type.upper()}_{timestamp}_{unique_id}"
     
@@ -40,40 +239,13 @@ class TaskExecutionRecord:
     ) -> str:
         """创建任务记录"""
         try:
-            task_id = self.generate_task_id(task_type, trigger_type)
-            start_time = datetime.now()
-            
-            sql = f"""
-            INSERT INTO {self.table_name} (
-                task_id, task_name, task_type, task_config_key, trigger_type, trigger_user,
-                start_time, status, batch_size, max_concurrent, 
-                execution_details, created_at, updated_at
-            ) VALUES (
-                :task_id, :task_name, :task_type, :task_config_key, :trigger_type, :trigger_user,
-                :start_time, 'running', :batch_size, :max_concurrent,
-                :execution_details, :created_at, :updated_at
+            params = self._build_create_params(
+                task_name, task_type, trigger_type, trigger_user,
+                batch_size, max_concurrent, execution_details, task_config_key
             )
-            """
+            task_id = params["task_id"]
             
-            # 转换执行详情为JSON字符串
-            details_json = json.dumps(execution_details, ensure_ascii=False) if execution_details else None
-            
-            params = {
-                "task_id": task_id,
-                "task_name": task_name,
-                "task_type": task_type,
-                "task_config_key": task_config_key,
-                "trigger_type": trigger_type,
-                "trigger_user": trigger_user,
-                "start_time": start_time,
-                "batch_size": batch_size,
-                "max_concurrent": max_concurrent,
-                "execution_details": details_json,
-                "created_at": start_time,
-                "updated_at": start_time
-            }
-            
-            db.execute(text(sql), params)
+            db.execute(self._CREATE_STMT, params)
             db.commit()
             
             logger.info(f"✅ 创建任务记录成功: {task_id} ({task_name})")
@@ -84,6 +256,60 @@ class TaskExecutionRecord:
             db.rollback()
             raise e
     
+    def _build_create_params(
+        self,
+        task_name: str,
+        task_type: str,
+        trigger_type: str = "scheduled",
+        trigger_user: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        max_concurrent: Optional[int] = None,
+        execution_details: Optional[Dict[str, Any]] = None,
+        task_config_key: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        构建单条任务记录的插入参数（生成任务ID，状态为running）
+        
+        created_at/updated_at 不传，由表上的 DEFAULT CURRENT_TIMESTAMP 填充
+        """
+        return {
+            "task_id": self.generate_task_id(task_type, trigger_type),
+            "task_name": task_name,
+            "task_type": task_type,
+            "task_config_key": task_config_key,
+            "trigger_type": trigger_type,
+            "trigger_user": trigger_user,
+            "start_time": datetime.now(),
+            "status": "running",
+            "batch_size": batch_size,
+            "max_concurrent": max_concurrent,
+            "execution_details": execution_details or None
+        }
+    
+    def _get_update_stmt(self, field_names: FrozenSet[str], with_duration: bool = False) -> Update:
+        """
+        获取（必要时构建并缓存）按任务ID更新给定字段集合的UPDATE语句
+        
+        执行参数中字段按同名键传入，任务ID以 TASK_ID_PARAM 传入
+        
+        Args:
+            field_names: 直接绑定同名参数的字段
+            with_duration: 是否在数据库端按 start_time 与 :end_time 计算 duration_seconds
+        """
+        key = (field_names, with_duration)
+        stmt = self._update_stmt_cache.get(key)
+        if stmt is None:
+            values: Dict[str, Any] = {name: bindparam(name) for name in field_names}
+            if with_duration:
+                values["duration_seconds"] = self._DURATION_EXPR
+            stmt = (
+                update(self.table)
+                .where(self.table.c.task_id == bindparam(self.TASK_ID_PARAM))
+                .values(values)
+            )
+            self._update_stmt_cache[key] = stmt
+        return stmt
+    
     def update_task_progress(
         self,
         db: Session,
@@ -100,76 +326,51 @@ class TaskExecutionRecord:
         extracted_records: Optional[int] = None,
         analyzed_records: Optional[int] = None,
         execution_details: Optional[Dict[str, Any]] = None,
-        performance_stats: Optional[Dict[str, Any]] = None
+        performance_stats: Optional[Dict[str, Any]] = None,
+        buffered: bool = False
     ) -> bool:
-        """更新任务进度"""
+        """
+        更新任务进度
+        
+        buffered=True 时只合并到内存缓冲，由后台定时器每 PROGRESS_FLUSH_INTERVAL 秒
+        批量写入一次，适合循环内的高频进度上报；阶段切换等需要立即可见的更新保持默认同步写入
+        """
         try:
-            update_fields = ["updated_at = :updated_at"]
             params = {
-                "task_id": task_id,
+                self.TASK_ID_PARAM: task_id,
                 "updated_at": datetime.now()
             }
             
-            if status is not None:
-                update_fields.append("status = :status")
-                params["status"] = status
-            
-            if process_stage is not None:
-                update_fields.append("process_stage = :process_stage")
-                params["process_stage"] = process_stage
-            
-            if total_records is not None:
-                update_fields.append("total_records = :total_records")
-                params["total_records"] = total_records
-            
-            if processed_records is not None:
-                update_fields.append("processed_records = :processed_records")
-                params["processed_records"] = processed_records
-            
-            if success_records is not None:
-                update_fields.append("success_records = :success_records")
-                params["success_records"] = success_records
-            
-            if failed_records is not None:
-                update_fields.append("failed_records = :failed_records")
-                params["failed_records"] = failed_records
-            
-            if skipped_records is not None:
-                update_fields.append("skipped_records = :skipped_records")
-                params["skipped_records"] = skipped_records
-            
-            if denoised_records is not None:
-                update_fields.append("denoised_records = :denoised_records")
-                params["denoised_records"] = denoised_records
-            
-            if duplicate_records is not None:
-                update_fields.append("duplicate_records = :duplicate_records")
-                params["duplicate_records"] = duplicate_records
-            
-            if extracted_records is not None:
-                update_fields.append("extracted_records = :extracted_records")
-                params["extracted_records"] = extracted_records
-            
-            if analyzed_records is not None:
-                update_fields.append("analyzed_records = :analyzed_records")
-                params["analyzed_records"] = analyzed_records
+            values = (
+                status, process_stage, total_records, processed_records, success_records,
+                failed_records, skipped_records, denoised_records, duplicate_records,
+                extracted_records, analyzed_records, execution_details, performance_stats
+            )
+            for name, value in zip(self._PROGRESS_FIELDS, values):
+                if value is not None:
+                    params[name] = value
             
-            if execution_details is not None:
-                update_fields.append("execution_details = :execution_details")
-                params["execution_details"] = json.dumps(execution_details, ensure_ascii=False)
+            # 除 updated_at 外没有要更新的字段，不必访问数据库
+            if len(params) == 2:
+                logger.debug(f"📊 任务进度无变化，跳过更新: {task_id}")
+                return True
             
-            if performance_stats is not None:
-                update_fields.append("performance_stats = :performance_stats")
-                params["performance_stats"] = json.dumps(performance_stats, ensure_ascii=False)
+            if buffered:
+                fields = {k: v for k, v in params.items() if k not in (self.TASK_ID_PARAM, "updated_at")}
+                self._buffer_progress(task_id, fields)
+                return True
             
-            sql = f"""
-            UPDATE {self.table_name}
-            SET {', '.join(update_fields)}
-            WHERE task_id = :task_id
-            """
+            # 该任务的缓冲进度并入本次写入（本次显式传入的字段优先），不再单独刷新
+            pending = self._take_pending(task_id)
+            params = {**pending, **params}
+            stmt = self._get_update_stmt(frozenset(params.keys() - {self.TASK_ID_PARAM}))
             
-            result = db.execute(text(sql), params)
-            db.commit()
+            try:
+                result = db.execute(stmt, params)
+                db.commit()
+            except Exception:
+                self._requeue_progress({task_id: pending})
+                raise
             
             if result.rowcount > 0:
                 logger.debug(f"📊 更新任务进度: {task_id}")
@@ -183,6 +384,120 @@ class TaskExecutionRecord:
             db.rollback()
             return False
     
+    def _buffer_progress(self, task_id: str, fields: Dict[str, Any]) -> None:
+        """合并进度字段到缓冲区，并确保有一个待执行的刷新定时器"""
+        with self._pending_lock:
+            self._pending_progress.setdefault(task_id, {}).update(fields)
+            if self._flush_timer is None:
+                self._flush_timer = threading.Timer(self.PROGRESS_FLUSH_INTERVAL, self.flush_pending_progress)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+    
+    def _take_pending(self, task_id: str) -> Dict[str, Any]:
+        """
+        取出该任务尚未落盘的缓冲进度，供同步写入合并
+        
+        正在写库的刷新批次包含该任务时，先等待该次刷新结束，避免其携带的旧值晚于同步写入
+        到达数据库；刷新失败放回的字段比之前取出的更旧，合并时不覆盖
+        """
+        fields: Dict[str, Any] = {}
+        while True:
+            with self._pending_lock:
+                fields = {**self._pending_progress.pop(task_id, {}), **fields}
+                if task_id not in self._flushing_ids:
+                    return fields
+                flush_done = self._flush_done
+            flush_done.wait()
+    
+    def _requeue_progress(self, pending: Dict[str, Dict[str, Any]]) -> None:
+        """
+        写入失败的进度放回缓冲区，由下次刷新或该任务的下次同步写入带上
+        
+        期间新缓冲的同名字段更新，保留新值
+        """
+        with self._pending_lock:
+            for task_id, fields in pending.items():
+                if fields:
+                    self._pending_progress[task_id] = {**fields, **self._pending_progress.get(task_id, {})}
+    
+    def flush_pending_progress(self) -> int:
+        """
+        将缓冲的进度更新写入数据库
+        
+        所有缓冲任务经 update_many_progress 合并为一条UPDATE、一次提交；
+        使用独立会话，可在定时器线程和应用关闭时调用；写入失败的进度放回缓冲区
+        
+        Returns:
+            写入的任务数（匹配到的行数）
+        """
+        with self._flush_lock:
+            with self._pending_lock:
+                pending, self._pending_progress = self._pending_progress, {}
+                if self._flush_timer is not None:
+                    self._flush_timer.cancel()
+                    self._flush_timer = None
+                if not pending:
+                    return 0
+                self._flushing_ids = frozenset(pending)
+                self._flush_done = flush_done = threading.Event()
+            
+            updates = [{**fields, "task_id": task_id} for task_id, fields in pending.items()]
+            written = 0
+            try:
+                with get_db_session() as db:
+                    written = self.update_many_progress(db, updates)
+                
+            except Exception as e:
+                logger.error(f"❌ 批量写入缓冲进度失败: {e}")
+            
+            if not written:
+                self._requeue_progress(pending)
+            with self._pending_lock:
+                self._flushing_ids = frozenset()
+            flush_done.set()
+            return written
+    
+    def update_many_progress(self, db: Session, updates: List[Dict[str, Any]]) -> int:
+        """
+        用一条UPDATE批量更新多个任务的进度
+        
+        每个字段生成 CASE task_id WHEN ... THEN ... ELSE 原值 END，未提供该字段的任务保持原值，
+        updated_at 统一为当前时间；一次往返、一次提交
+        
+        Args:
+            updates: 每项包含 task_id 及 _PROGRESS_FIELDS 中需要更新的字段
+            
+        Returns:
+            匹配到的任务数，失败时为0
+        """
+        if not updates:
+            return 0
+        
+        t = self.table
+        task_ids = [update_item["task_id"] for update_item in updates]
+        try:
+            values: Dict[str, Any] = {"updated_at": datetime.now()}
+            for name in self._PROGRESS_FIELDS:
+                column = t.c[name]
+                whens = {
+                    update_item["task_id"]: literal(update_item[name], column.type)
+                    for update_item in updates if name in update_item
+                }
+                if whens:
+                    values[name] = case(whens, value=t.c.task_id, else_=column)
+            
+            stmt = update(t).where(t.c.task_id.in_(task_ids)).values(values)
+            result = db.execute(stmt)
+            db.commit()
+            
+            logger.debug(f"📊 批量写入 {len(updates)} 个任务的进度")
+            return result.rowcount
+            
+        except Exception as e:
+            logger.error(f"❌ 批量更新任务进度失败: {task_ids}, {e}")
+            db.rollback()
+            return 0
+    
     def complete_task(
         self,
         db: Session,
@@ -196,59 +511,42 @@ class TaskExecutionRecord:
         try:
             end_time = datetime.now()
             
-            # 先获取开始时间以计算时长
-            start_time_sql = f"SELECT start_time FROM {self.table_name} WHERE task_id = :task_id"
-            start_result = db.execute(text(start_time_sql), {"task_id": task_id}).fetchone()
-            
-            if not start_result:
-                logger.error(f"❌ 任务记录不存在: {task_id}")
-                return False
-            
-            start_time = start_result[0]
-            duration_seconds = int((end_time - start_time).total_seconds())
-            
-            update_fields = [
-                "status = :status",
-                "end_time = :end_time", 
-                "duration_seconds = :duration_seconds",
-                "updated_at = :updated_at"
-            ]
-            
             params = {
-                "task_id": task_id,
+                self.TASK_ID_PARAM: task_id,
                 "status": status,
                 "end_time": end_time,
-                "duration_seconds": duration_seconds,
                 "updated_at": end_time
             }
             
             if error_message is not None:
-                update_fields.append("error_message = :error_message")
                 params["error_message"] = error_message
             
             if execution_details is not None:
-                update_fields.append("execution_details = :execution_details")
-                params["execution_details"] = json.dumps(execution_details, ensure_ascii=False)
+                params["execution_details"] = execution_details
             
             if performance_stats is not None:
-                update_fields.append("performance_stats = :performance_stats")
-                params["performance_stats"] = json.dumps(performance_stats, ensure_ascii=False)
+                params["performance_stats"] = performance_stats
             
-            sql = f"""
-            UPDATE {self.table_name}
-            SET {', '.join(update_fields)}
-            WHERE task_id = :task_id
-            """
+            # 缓冲中的进度随完成状态一并写入，之后不会再有该任务的迟到刷新
+            pending = self._take_pending(task_id)
+            params = {**pending, **params}
+            stmt = self._get_update_stmt(
+                frozenset(params.keys() - {self.TASK_ID_PARAM}), with_duration=True
+            )
             
-            result = db.execute(text(sql), params)
-            db.commit()
+            try:
+                result = db.execute(stmt, params)
+                db.commit()
+            except Exception:
+                self._requeue_progress({task_id: pending})
+                raise
             
             if result.rowcount > 0:
                 status_icon = "✅" if status == "completed" else "❌"
-                logger.info(f"{status_icon} 任务完成: {task_id}, 状态: {status}, 耗时: {duration_seconds}秒")
+                logger.info(f"{status_icon} 任务完成: {task_id}, 状态: {status}")
                 return True
             else:
-                logger.error(f"❌ 更新任务记录失败: {task_id}")
+                logger.error(f"❌ 任务记录不存在: {task_id}")
                 return False
                 
         except Exception as e:
@@ -256,23 +554,22 @@ class TaskExecutionRecord:
             db.rollback()
             return False
     
-    def get_task_record(self, db: Session, task_id: str) -> Optional[Dict[str, Any]]:
-        """获取单个任务记录"""
+    def get_task_record(
+        self,
+        db: Session,
+        task_id: str,
+        include_details: bool = True
+    ) -> Optional[Dict[str, Any]]:
+        """
+        获取单个任务记录
+        
+        Args:
+            include_details: 是否查询 execution_details/performance_stats 两个JSON列；
+                为False时不读取这两列，返回中对应字段为None
+        """
         try:
-            sql = f"""
-            SELECT 
-                id, task_id, task_name, task_type, task_config_key, trigger_type, trigger_user,
-                start_time, end_time, duration_seconds, status, process_stage,
-                total_records, processed_records, success_records, failed_records,
-                skipped_records, denoised_records, duplicate_records,
-                extracted_records, analyzed_records, batch_size, max_concurrent,
-                error_message, execution_details, performance_stats,
-                created_at, updated_at
-            FROM {self.table_name}
-            WHERE task_id = :task_id
-            """
-            
-            result = db.execute(text(sql), {"task_id": task_id}).fetchone()
+            stmt = self._GET_RECORD_STMT if include_details else self._GET_SUMMARY_STMT
+            result = db.execute(stmt, {"task_id": task_id}).fetchone()
             
             if result:
                 return self._format_task_record(result)
@@ -291,206 +588,133 @@ class TaskExecutionRecord:
         status: Optional[str] = None,
         trigger_type: Optional[str] = None,
         start_date: Optional[datetime] = None,
-        end_date: Optional[datetime] = None
+        end_date: Optional[datetime] = None,
+        cursor: Optional[Tuple[datetime, int]] = None
     ) -> List[Dict[str, Any]]:
-        """获取任务记录列表"""
+        """
+        获取任务记录列表
+        
+        Args:
+            cursor: 键集分页游标，即上一页最后一条记录的 (start_time, id)；
+                提供时从该记录之后继续取，忽略 offset，深翻页不再需要扫描并丢弃前面的行
+        """
         try:
-            where_conditions = []
-            params = {"limit": limit, "offset": offset}
-            
-            if task_type:
-                where_conditions.append("task_type = :task_type")
-                params["task_type"] = task_type
-            
-            if status:
-                where_conditions.append("status = :status")
-                params["status"] = status
-            
-            if trigger_type:
-                where_conditions.append("trigger_type = :trigger_type")
-                params["trigger_type"] = trigger_type
-            
-            if start_date:
-                where_conditions.append("start_time >= :start_date")
-                params["start_date"] = start_date
-            
-            if end_date:
-                where_conditions.append("start_time <= :end_date")
-                params["end_date"] = end_date
-            
-            where_clause = " AND ".join(where_conditions) if where_conditions else "1=1"
-            
-            sql = f"""
-            SELECT 
-                id, task_id, task_name, task_type, task_config_key, trigger_type, trigger_user,
-                start_time, end_time, duration_seconds, status, process_stage,
-                total_records, processed_records, success_records, failed_records,
-                skipped_records, denoised_records, duplicate_records,
-                extracted_records, analyzed_records, batch_size, max_concurrent,
-                error_message, execution_details, performance_stats,
-                created_at, updated_at
-            FROM {self.table_name}
-            WHERE {where_clause}
-            ORDER BY start_time DESC
-            LIMIT :limit OFFSET :offset
-            """
-            
-            result = db.execute(text(sql), params)
-            
-            records = []
-            for row in result:
-                records.append(self._format_task_record(row))
-            
-            return records
+            stmt = self._build_records_stmt(
+                limit, offset, task_type, status, trigger_type, start_date, end_date, cursor
+            )
+            # 分页查询行数有限，一次取回即可；服务端游标只留给 iter_task_records 的导出场景
+            return [self._format_task_record(row) for row in db.execute(stmt)]
             
         except Exception as e:
             logger.error(f"❌ 获取任务记录列表失败: {e}")
             return []
     
-    def get_task_by_id(self, db: Session, task_id: str) -> Optional[Dict[str, Any]]:
-        """根据任务ID获取单个任务记录"""
-        try:
-            sql = f"""
-            SELECT * FROM {self.table_name}
-            WHERE task_id = :task_id
-            """
-            
-            result = db.execute(text(sql), {"task_id": task_id})
-            row = result.fetchone()
-            
-            if not row:
-                return None
-            
-            # 解析JSON字段
-            execution_details = {}
-            performance_stats = {}
-            
-            if row.execution_details:
-                try:
-                    execution_details = json.loads(row.execution_details)
-                except:
-                    execution_details = {"raw": row.execution_details}
-            
-            if row.performance_stats:
-                try:
-                    performance_stats = json.loads(row.performance_stats)
-                except:
-                    performance_stats = {"raw": row.performance_stats}
-            
-            # 计算完成率（确保不超过100%）
-            completion_rate = 0.0
-            if row.total_records and row.total_records > 0:
-                processed = min(row.processed_records or 0, row.total_records)
-                completion_rate = processed / row.total_records * 100
-            
-            # 计算成功率
-            success_rate = 0.0
-            if row.processed_records and row.processed_records > 0:
-                success_rate = (row.success_records or 0) / row.processed_records * 100
-            
-            # 计算跳过的记录数（兼容旧数据）
-            skipped_records = getattr(row, 'skipped_records', 0) or 0
-            denoised_records = getattr(row, 'denoised_records', 0) or 0
-            duplicate_records = getattr(row, 'duplicate_records', 0) or 0
-            
-            # 如果没有跳过记录数据，从总数中计算
-            if skipped_records == 0 and row.total_records and (row.success_records or 0) + (row.failed_records or 0) < row.total_records:
-                skipped_records = row.total_records - (row.success_records or 0) - (row.failed_records or 0)
-            
-            # 计算实际处理率和成功率
-            actual_processed = (row.success_records or 0) + (row.failed_records or 0)
-            actual_completion_rate = 0.0
-            if row.total_records and row.total_records > 0:
-                actual_completion_rate = actual_processed / row.total_records * 100
-
-            return {
-                "id": row.id,
-                "task_id": row.task_id,
-                "task_name": row.task_name,
-                "task_type": row.task_type,
-                "trigger_type": row.trigger_type,
-                "trigger_user": row.trigger_user,
-                "start_time": row.start_time.isoformat() if row.start_time else None,
-                "end_time": row.end_time.isoformat() if row.end_time else None,
-                "duration_seconds": row.duration_seconds,
-                "status": row.status,
-                "process_stage": row.process_stage,
-                "total_records": row.total_records,
-                "processed_records": row.processed_records,
-                "success_records": row.success_records,
-                "failed_records": row.failed_records,
-                "skipped_records": skipped_records,  # 新增：跳过的记录数
-                "denoised_records": denoised_records,  # 新增：去燥的记录数
-                "duplicate_records": duplicate_records,  # 新增：重复的记录数
-                "extracted_records": row.extracted_records,
-                "analyzed_records": row.analyzed_records,
-                "batch_size": row.batch_size,
-                "max_concurrent": row.max_concurrent,
-                "error_message": row.error_message,
-                "execution_details": execution_details,
-                "performance_stats": performance_stats,
-                "completion_rate": round(completion_rate, 2),  # 原始完成率
-                "actual_completion_rate": round(actual_completion_rate, 2),  # 实际处理完成率
-                "success_rate": round(success_rate, 2),
-                "created_at": row.created_at.isoformat() if row.created_at else None,
-                "updated_at": row.updated_at.isoformat() if row.updated_at else None
-            }
-            
-        except Exception as e:
-            logger.error(f"❌ 获取任务记录失败: {task_id}, {e}")
-            return None
+    def iter_task_records(
+        self,
+        db: Session,
+        limit: int = 50,
+        offset: int = 0,
+        task_type: Optional[str] = None,
+        status: Optional[str] = None,
+        trigger_type: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        cursor: Optional[Tuple[datetime, int]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        逐条产出任务记录（参数同 get_task_records）
+        
+        使用服务端游标按 yield_per 分块拉取，导出等大 limit 场景内存占用有界；
+        迭代结束前该会话的连接被结果集占用，不能穿插其他查询。异常直接抛给调用方
+        """
+        stmt = self._build_records_stmt(
+            limit, offset, task_type, status, trigger_type, start_date, end_date, cursor
+        )
+        result = db.execute(
+            stmt,
+            execution_options={"stream_results": True, "yield_per": 200}
+        )
+        
+        for row in result:
+            yield self._format_task_record(row)
+    
+    def _build_records_stmt(
+        self,
+        limit: int,
+        offset: int,
+        task_type: Optional[str],
+        status: Optional[str],
+        trigger_type: Optional[str],
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+        cursor: Optional[Tuple[datetime, int]]
+    ) -> Select:
+        """构建任务记录列表查询（get_task_records / iter_task_records 共用）"""
+        t = self.table
+        stmt = select(*self._RECORD_COLUMNS)
+        
+        if task_type:
+            stmt = stmt.where(t.c.task_type == task_type)
+        
+        if status:
+            stmt = stmt.where(t.c.status == status)
+        
+        if trigger_type:
+            stmt = stmt.where(t.c.trigger_type == trigger_type)
+        
+        if start_date:
+            stmt = stmt.where(t.c.start_time >= start_date)
+        
+        if end_date:
+            stmt = stmt.where(t.c.start_time <= end_date)
+        
+        if cursor:
+            cursor_start_time, cursor_id = cursor
+            stmt = stmt.where(or_(
+                t.c.start_time < cursor_start_time,
+                and_(t.c.start_time == cursor_start_time, t.c.id < cursor_id)
+            ))
+        
+        return (
+            stmt.order_by(t.c.start_time.desc(), t.c.id.desc())
+            .limit(limit)
+            .offset(0 if cursor else offset)
+        )
+    
+    def get_task_summary(self, db: Session, task_id: str) -> Optional[Dict[str, Any]]:
+        """获取任务摘要（状态、计数、时间），不读取JSON详情列，供状态检查等轻量场景使用"""
+        return self.get_task_record(db, task_id, include_details=False)
     
     def get_task_statistics(self, db: Session, days: int = 7) -> Dict[str, Any]:
         """获取任务统计信息"""
         try:
-            # 按状态统计
-            status_sql = f"""
-            SELECT status, COUNT(*) as count
-            FROM {self.table_name}
-            WHERE start_time >= DATE_SUB(NOW(), INTERVAL :days DAY)
-            GROUP BY status
-            """
-            
-            status_result = db.execute(text(status_sql), {"days": days})
-            status_stats = {row[0]: row[1] for row in status_result}
-            
-            # 按任务类型统计
-            type_sql = f"""
-            SELECT task_type, COUNT(*) as count, 
-                   AVG(duration_seconds) as avg_duration,
-                   SUM(success_records) as total_success,
-                   SUM(failed_records) as total_failed
-            FROM {self.table_name}
-            WHERE start_time >= DATE_SUB(NOW(), INTERVAL :days DAY)
-            GROUP BY task_type
-            """
-            
-            type_result = db.execute(text(type_sql), {"days": days})
+            # 按类型+状态分组并对类型做ROLLUP，一次查询同时得到状态统计（明细行按状态累加）
+            # 和类型统计（GROUPING(status)=1 的小计行）；总计行不需要
+            status_stats: Dict[str, int] = {}
             type_stats = {}
-            for row in type_result:
-                type_stats[row[0]] = {
-                    "count": row[1],
-                    "avg_duration": float(row[2] or 0),
-                    "total_success": row[3] or 0,
-                    "total_failed": row[4] or 0
-                }
+            for row in db.execute(self._STATISTICS_SQL, {"days": days}):
+                if row.type_rollup:
+                    continue
+                if row.status_rollup:
+                    type_stats[row.task_type] = {
+                        "count": row.task_count,
+                        "avg_duration": float(row.avg_duration or 0),
+                        "total_success": row.total_success or 0,
+                        "total_failed": row.total_failed or 0
+                    }
+                else:
+                    status_stats[row.status] = status_stats.get(row.status, 0) + row.task_count
             
             # 最近执行记录
-            recent_sql = f"""
-            SELECT task_id, task_name, status, start_time, duration_seconds
-            FROM {self.table_name}
-            ORDER BY start_time DESC
-            LIMIT 10
-            """
-            
-            recent_result = db.execute(text(recent_sql))
+            recent_result = db.execute(self._RECENT_TASKS_STMT)
+            iso = datetime.isoformat
             recent_tasks = []
             for row in recent_result:
                 recent_tasks.append({
                     "task_id": row[0],
                     "task_name": row[1],
                     "status": row[2],
-                    "start_time": row[3].isoformat() if row[3] else None,
+                    "start_time": iso(row[3]) if row[3] else None,
                     "duration_seconds": row[4]
                 })
             
@@ -506,105 +730,45 @@ class TaskExecutionRecord:
             return {}
     
     def _format_task_record(self, row) -> Dict[str, Any]:
-        """格式化任务记录"""
+        """
+        格式化任务记录
+        
+        跳过数、总处理数及各比率已由 _build_derived_columns 在SQL中算好，这里只做组装和取整
+        """
+        iso = datetime.isoformat
         try:
-            # 解析JSON字段
-            execution_details = None
-            performance_stats = None
-            
-            if row.execution_details:
-                try:
-                    execution_details = json.loads(row.execution_details)
-                except:
-                    execution_details = {"raw": row.execution_details}
-            
-            if row.performance_stats:
-                try:
-                    performance_stats = json.loads(row.performance_stats)
-                except:
-                    performance_stats = {"raw": row.performance_stats}
-            
-            # 计算跳过的记录数（兼容旧数据）
-            skipped_records = getattr(row, 'skipped_records', 0) or 0
-            denoised_records = getattr(row, 'denoised_records', 0) or 0
-            duplicate_records = getattr(row, 'duplicate_records', 0) or 0
-            
-            # 如果没有跳过记录数据，从总数中计算
-            if skipped_records == 0 and row.total_records and (row.success_records or 0) + (row.failed_records or 0) < row.total_records:
-                skipped_records = row.total_records - (row.success_records or 0) - (row.failed_records or 0)
-            
-            # 🔥 修复进度计算逻辑：
-            # 1. actual_processed: 实际执行过的记录数（成功+失败，不包括跳过）
-            # 2. total_processed: 使用数据库中的processed_records字段（如果存在），否则计算所有处理过的记录数
-            # 3. completion_rate: 总体完成率，包括跳过的记录
-            actual_processed = (row.success_records or 0) + (row.failed_records or 0)
-            
-            # 🔥 优先使用数据库中的processed_records字段（这是API层正确维护的值）
-            if hasattr(row, 'processed_records') and row.processed_records is not None:
-                total_processed = row.processed_records
-            else:
-                # 向后兼容：如果没有processed_records字段，则重新计算
-                total_processed = actual_processed + skipped_records
-            
-            # 计算完成率（包括跳过的记录，确保不超过100%）
-            completion_rate = 0.0
-            if row.total_records and row.total_records > 0:
-                # 🔥 修复：区分抽取阶段和分析阶段的进度计算
-                process_stage = getattr(row, 'process_stage', '')
-                
-                # 如果是抽取阶段或刚完成抽取，且实际处理记录为0，则进度应该是0%
-                if (process_stage and ('抽取' in process_stage or '开始分析' in process_stage) 
-                    and actual_processed == 0):
-                    completion_rate = 0.0
-                else:
-                    processed = min(total_processed, row.total_records)
-                    completion_rate = processed / row.total_records * 100
-            elif row.total_records == 0:
-                # 🔥 修复：当总数为0时，进度应该是100%（没有任务要处理时认为已完成）
-                completion_rate = 100.0
-            
-            # 计算实际处理完成率（不包括跳过的记录）
-            actual_completion_rate = 0.0
-            if row.total_records and row.total_records > 0:
-                actual_completion_rate = actual_processed / row.total_records * 100
-            
-            # 计算成功率（基于实际处理的记录）
-            success_rate = 0.0
-            if actual_processed > 0:
-                success_rate = (row.success_records or 0) / actual_processed * 100
-
             return {
                 "id": row.id,
                 "task_id": row.task_id,
                 "task_name": row.task_name,
                 "task_type": row.task_type,
-                "task_config_key": getattr(row, 'task_config_key', None),
+                "task_config_key": row.task_config_key,
                 "trigger_type": row.trigger_type,
                 "trigger_user": row.trigger_user,
-                "start_time": row.start_time.isoformat() if row.start_time else None,
-                "end_time": row.end_time.isoformat() if row.end_time else None,
+                "start_time": iso(row.start_time) if row.start_time else None,
+                "end_time": iso(row.end_time) if row.end_time else None,
                 "duration_seconds": row.duration_seconds,
                 "status": row.status,
                 "process_stage": row.process_stage,
                 "total_records": row.total_records,
-                "processed_records": total_processed,  # 🔥 修复：使用实际的总处理数（包括跳过）
+                "processed_records": row.processed_records,  # 🔥 修复：使用实际的总处理数（包括跳过）
                 "success_records": row.success_records,
                 "failed_records": row.failed_records,
-                "skipped_records": skipped_records,  # 新增：跳过的记录数
-                "denoised_records": denoised_records,  # 新增：去燥的记录数
-                "duplicate_records": duplicate_records,  # 新增：重复的记录数
+                "skipped_records": row.skipped_records,  # 新增：跳过的记录数
+                "denoised_records": row.denoised_records or 0,  # 新增：去燥的记录数
+                "duplicate_records": row.duplicate_records or 0,  # 新增：重复的记录数
                 "extracted_records": row.extracted_records,
                 "analyzed_records": row.analyzed_records,
                 "batch_size": row.batch_size,
                 "max_concurrent": row.max_concurrent,
                 "error_message": row.error_message,
-                "execution_details": execution_details,
-                "performance_stats": performance_stats,
-                "completion_rate": round(completion_rate, 2),  # 原始完成率
-                "actual_completion_rate": round(actual_completion_rate, 2),  # 实际处理完成率
-                "success_rate": round(success_rate, 2),
-                "created_at": row.created_at.isoformat() if row.created_at else None,
-                "updated_at": row.updated_at.isoformat() if row.updated_at else None
+                "execution_details": getattr(row, "execution_details", None) or None,
+                "performance_stats": getattr(row, "performance_stats", None) or None,
+                "completion_rate": round(float(row.completion_rate), 2),  # 原始完成率
+                "actual_completion_rate": round(float(row.actual_completion_rate), 2),  # 实际处理完成率
+                "success_rate": round(float(row.success_rate), 2),
+                "created_at": iso(row.created_at) if row.created_at else None,
+                "updated_at": iso(row.updated_at) if row.updated_at else None
             }
             
         except Exception as e:
@@ -612,26 +776,32 @@ class TaskExecutionRecord:
             return {"error": "格式化失败"}
     
     def cleanup_old_records(self, db: Session, days_to_keep: int = 30) -> int:
-        """清理旧的任务记录"""
+        """
+        清理旧的任务记录
+        
+        按 start_time 顺序每次删除 CLEANUP_BATCH_SIZE 条并立即提交，
+        避免单条大DELETE长时间持锁、撑大undo日志
+        """
+        deleted_count = 0
         try:
-            sql = f"""
-            DELETE FROM {self.table_name}
-            WHERE start_time < DATE_SUB(NOW(), INTERVAL :days_to_keep DAY)
-            AND status IN ('completed', 'failed', 'cancelled')
-            """
+            while True:
+                result = db.execute(
+                    self._CLEANUP_SQL,
+                    {"days_to_keep": days_to_keep, "batch_size": self.CLEANUP_BATCH_SIZE}
+                )
+                db.commit()
+                deleted_count += result.rowcount
+                if result.rowcount < self.CLEANUP_BATCH_SIZE:
+                    break
             
-            result = db.execute(text(sql), {"days_to_keep": days_to_keep})
-            db.commit()
-            
-            deleted_count = result.rowcount
             logger.info(f"🧹 清理了 {deleted_count} 条 {days_to_keep} 天前的任务记录")
             
             return deleted_count
             
         except Exception as e:
-            logger.error(f"❌ 清理旧任务记录失败: {e}")
+            logger.error(f"❌ 清理旧任务记录失败（已清理 {deleted_count} 条）: {e}")
             db.rollback()
-            return 0
+            return deleted_count
 
 
 # 全局任务记录实例
@@ -1,119 +1,334 @@
 """
 任务配置数据模型
 """
-import json
-from datetime import datetime, timedelta
-from typing import Dict, Any, Optional, List
-from sqlalchemy import text
+import copy
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Any, Optional, List, ClassVar, Tuple, Iterator
+
+import orjson
+from sqlalchemy import (
+    MetaData, Table, Column, BigInteger, Integer, String, Text, DateTime, Boolean,
+    Select, Insert, Update, Delete,
+    select, insert, update, delete, bindparam, func, literal, literal_column, true, and_, or_, case, text
+)
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.orm import Session
 
-import logging
+from app.models.denoise import safe_json_dumps
 
 logger = logging.getLogger(__name__)
 
 
+def _load_task_params(raw: Any) -> Dict[str, Any]:
+    """解析 task_params 列：空值直接返回空字典，非法JSON保留原值"""
+    if not raw:
+        return {}
+    if not isinstance(raw, (str, bytes, bytearray)):
+        return raw
+    try:
+        return orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        return {"raw": raw}
+
+
+# 表结构由 sql/ 下的迁移脚本维护，这里使用独立的 MetaData，不参与 create_tables()
+# task_params 由本模块自行序列化/解析（safe_json_dumps / _load_task_params），按文本列绑定，
+# 避免驱动层再做一次JSON编解码
+ai_task_configs = Table(
+    "ai_task_configs",
+    MetaData(),
+    Column("id", BigInteger, primary_key=True, autoincrement=True),
+    Column("task_key", String(100), nullable=False, unique=True),
+    Column("task_name", String(200), nullable=False),
+    Column("task_description", Text),
+    Column("task_type", String(20)),
+    Column("is_enabled", Boolean),
+    Column("schedule_interval", BigInteger, nullable=False),
+    Column("schedule_cron", String(100)),
+    Column("max_concurrent", Integer),
+    Column("default_batch_size", Integer),
+    Column("task_handler", String(200), nullable=False),
+    Column("task_params", Text),
+    Column("priority", Integer),
+    Column("timeout_seconds", Integer),
+    Column("retry_times", Integer),
+    Column("last_execution_time", DateTime),
+    Column("next_execution_time", DateTime),
+    Column("execution_count", BigInteger),
+    Column("success_count", BigInteger),
+    Column("failure_count", BigInteger),
+    Column("created_by", String(100)),
+    Column("created_at", DateTime, server_default=func.current_timestamp()),
+    Column("updated_at", DateTime, server_default=func.current_timestamp()),
+)
+
+
+def _build_update_stats_stmts(t: Table, key_param: str) -> Dict[Tuple[bool, bool, Optional[bool]], Update]:
+    """按 (是否更新上次执行时间, 是否更新下次执行时间, success) 预构建全部执行统计UPDATE变体"""
+    stmts = {}
+    for has_last in (False, True):
+        for has_next in (False, True):
+            for success in (None, True, False):
+                values: Dict[str, Any] = {"updated_at": func.current_timestamp()}
+                if has_last:
+                    values["last_execution_time"] = bindparam("last_execution_time")
+                if has_next:
+                    values["next_execution_time"] = bindparam("next_execution_time")
+                # 只有在success不为None时才更新计数
+                if success is not None:
+                    values["execution_count"] = t.c.execution_count + 1
+                    counter = t.c.success_count if success else t.c.failure_count
+                    values[counter.name] = counter + 1
+                stmts[(has_last, has_next, success)] = (
+                    update(t).where(t.c.task_key == bindparam(key_param)).values(values)
+                )
+    return stmts
+
+
+def _build_update_config_stmt(t: Table, field_names: Tuple[str, ...], key_param: str) -> Update:
+    """
+    固定形态的配置更新：每个字段带 set_<字段> 开关，未提供的字段保持原值；
+    与 COALESCE 不同，显式传入 None 仍可把可空字段置为 NULL
+    """
+    values: Dict[str, Any] = {
+        name: func.if_(bindparam(f"set_{name}"), bindparam(name), t.c[name]) for name in field_names
+    }
+    values["updated_at"] = func.current_timestamp()
+    return update(t).where(t.c.task_key == bindparam(key_param)).values(values)
+
+
 class TaskConfig:
     """任务配置模型"""
     
+    table: ClassVar[Table] = ai_task_configs
+    TABLE_NAME: ClassVar[str] = ai_task_configs.name
+    
+    # UPDATE 语句中任务键的绑定参数名；不能与列名同名，否则会被当作 SET 字段
+    TASK_KEY_PARAM: ClassVar[str] = "target_task_key"
+    
+    # 固定的语句在类加载时构建一次，SQLAlchemy 按结构缓存编译结果，各次调用只绑定参数
+    _ORDER_BY: ClassVar[Tuple[Any, ...]] = (table.c.priority.asc(), table.c.task_name.asc())
+    
+    _SCHEDULED_FILTER: ClassVar[Any] = and_(
+        table.c.is_enabled == true(),
+        table.c.task_type.in_(("scheduled", "both")),
+    )
+    
+    # 列表/详情输出的全部列，状态文字在SQL中算好（is_enabled 由 Boolean 类型在驱动层转为 bool）
+    _FULL_COLUMNS: ClassVar[Tuple[Any, ...]] = (
+        *table.c,
+        case((table.c.is_enabled == true(), "生效"), else_="不生效").label("status"),
+    )
+    
+    _GET_ALL_STMT: ClassVar[Select] = select(*_FULL_COLUMNS).order_by(*_ORDER_BY)
+    
+    _GET_ALL_ENABLED_STMT: ClassVar[Select] = (
+        select(*_FULL_COLUMNS).where(table.c.is_enabled == true()).order_by(*_ORDER_BY)
+    )
+    
+    _GET_BY_KEY_STMT: ClassVar[Select] = select(*_FULL_COLUMNS).where(table.c.task_key == bindparam("task_key"))
+    
+    _GET_ENABLED_SCHEDULED_STMT: ClassVar[Select] = (
+        select(*_FULL_COLUMNS).where(_SCHEDULED_FILTER).order_by(*_ORDER_BY)
+    )
+    
+    # 从未执行过，或距上次执行已满一个调度间隔的任务
+    _GET_DUE_STMT: ClassVar[Select] = (
+        select(*_FULL_COLUMNS)
+        .where(
+            _SCHEDULED_FILTER,
+            or_(
+                table.c.last_execution_time.is_(None),
+                func.timestampdiff(
+                    literal_column("SECOND"), table.c.last_execution_time, bindparam("current_time")
+                ) >= table.c.schedule_interval,
+            ),
+        )
+        .order_by(*_ORDER_BY)
+    )
+    
+    # created_at / updated_at 由服务端默认值填充
+    _CREATE_STMT: ClassVar[Insert] = insert(table)
+    
+    _DELETE_STMT: ClassVar[Delete] = delete(table).where(table.c.task_key == bindparam("task_key"))
+    
+    _UPDATE_ENABLED_STMT: ClassVar[Update] = (
+        update(table)
+        .where(table.c.task_key == bindparam(TASK_KEY_PARAM))
+        .values(is_enabled=bindparam("is_enabled"), updated_at=func.current_timestamp())
+    )
+    
+    _UPDATE_STATS_STMTS: ClassVar[Dict[Tuple[bool, bool, Optional[bool]], Update]] = (
+        _build_update_stats_stmts(table, TASK_KEY_PARAM)
+    )
+    
+    # 允许通过 update_task_config 更新的字段
+    _UPDATABLE_FIELDS: ClassVar[Tuple[str, ...]] = (
+        'task_name', 'task_description', 'task_type', 'is_enabled',
+        'schedule_interval', 'schedule_cron', 'max_concurrent', 
+        'default_batch_size', 'task_params', 'priority', 
+        'timeout_seconds', 'retry_times'
+    )
+    
+    _UPDATE_CONFIG_STMT: ClassVar[Update] = _build_update_config_stmt(table, _UPDATABLE_FIELDS, TASK_KEY_PARAM)
+    
+    # MySQL 唯一键冲突错误码（ER_DUP_ENTRY）
+    _DUPLICATE_ENTRY_ERRNO: ClassVar[int] = 1062
+    
+    # 任务列表缓存有效期（秒）；配置很少变化，而调度器和列表接口会频繁读取
+    LIST_CACHE_TTL: ClassVar[float] = 30.0
+    
     def __init__(self):
-        self.table_name = "ai_task_configs"
+        self.table_name = self.TABLE_NAME
+        # 列表查询缓存：缓存键 -> (写入时的 monotonic 时间, 格式化后的任务列表)
+        self._list_cache: Dict[str, Tuple[float, List[Dict[str, Any]]]] = {}
+        # 每次写操作递增；查询期间版本变化则结果不入缓存，避免把失效前读到的旧数据写回
+        self._cache_version = 0
+        self._cache_lock = threading.Lock()
+        # 调试日志开启时，首次查询启用定时任务前检查一次执行计划
+        self._plan_checked = False
+    
+    @staticmethod
+    def _copy_task(task: Dict[str, Any]) -> Dict[str, Any]:
+        """复制任务配置字典；task_params 是唯一的可变嵌套值，一并深拷贝"""
+        task_copy = task.copy()
+        task_copy["task_params"] = copy.deepcopy(task["task_params"])
+        return task_copy
+    
+    def _get_cached_list(self, cache_key: str) -> Optional[List[Dict[str, Any]]]:
+        """读取未过期的列表缓存，返回副本（含 task_params），调用方修改不会污染缓存"""
+        entry = self._list_cache.get(cache_key)
+        if entry is None or time.monotonic() - entry[0] >= self.LIST_CACHE_TTL:
+            return None
+        return [self._copy_task(task) for task in entry[1]]
+    
+    def _store_cached_list(self, cache_key: str, version: int, tasks: List[Dict[str, Any]]) -> None:
+        """在版本未变化时写入列表缓存"""
+        with self._cache_lock:
+            if version == self._cache_version:
+                self._list_cache[cache_key] = (time.monotonic(), [self._copy_task(task) for task in tasks])
+    
+    def invalidate_cache(self) -> None:
+        """使列表缓存失效；所有写操作成功后调用"""
+        with self._cache_lock:
+            self._cache_version += 1
+            self._list_cache.clear()
     
     def get_all_tasks(self, db: Session, enabled_only: bool = False) -> List[Dict[str, Any]]:
-        """获取所有任务配置"""
+        """获取所有任务配置（结果缓存 LIST_CACHE_TTL 秒，写操作后失效）"""
+        cache_key = "all_enabled" if enabled_only else "all"
+        cached = self._get_cached_list(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
-            where_clause = "WHERE is_enabled = TRUE" if enabled_only else ""
-            
-            sql = f"""
-            SELECT 
-                id, task_key, task_name, task_description, task_type, is_enabled,
-                schedule_interval, schedule_cron, max_concurrent, default_batch_size,
-                task_handler, task_params, priority, timeout_seconds, retry_times,
-                last_execution_time, next_execution_time, execution_count, 
-                success_count, failure_count, created_by, created_at, updated_at
-            FROM {self.table_name}
-            {where_clause}
-            ORDER BY priority ASC, task_name ASC
-            """
-            
-            result = db.execute(text(sql))
-            
-            tasks = []
-            for row in result:
-                tasks.append(self._format_task_config(row))
+            version = self._cache_version
+            # 列表整体返回并缓存，一次取回即可；服务端游标只留给 iter_all_tasks
+            result = db.execute(self._GET_ALL_ENABLED_STMT if enabled_only else self._GET_ALL_STMT)
+            tasks = [self._format_task_config(row) for row in result]
             
+            self._store_cached_list(cache_key, version, tasks)
             return tasks
             
-        except Exception as e:
+        except SQLAlchemyError as e:
             logger.error(f"❌ 获取任务配置列表失败: {e}")
             return []
     
-    def get_task_by_key(self, db: Session, task_key: str) -> Optional[Dict[str, Any]]:
-        """根据任务键获取任务配置"""
+    def iter_all_tasks(self, db: Session, enabled_only: bool = False) -> Iterator[Dict[str, Any]]:
+        """
+        逐条产出任务配置（不经过列表缓存）
+        
+        使用服务端游标按 yield_per 分块拉取，只需遍历的调用方内存占用有界；
+        迭代结束前该会话的连接被结果集占用，不能穿插其他查询。异常直接抛给调用方
+        """
+        result = db.execute(
+            self._GET_ALL_ENABLED_STMT if enabled_only else self._GET_ALL_STMT,
+            execution_options={"stream_results": True, "yield_per": 500}
+        )
+        
+        for row in result:
+            yield self._format_task_config(row)
+    
+    def get_task_by_key(
+        self,
+        db: Session,
+        task_key: str,
+        serialize_times: bool = True
+    ) -> Optional[Dict[str, Any]]:
+        """根据任务键获取任务配置（serialize_times=False 时时间字段保持 datetime）"""
         try:
-            sql = f"""
-            SELECT 
-                id, task_key, task_name, task_description, task_type, is_enabled,
-                schedule_interval, schedule_cron, max_concurrent, default_batch_size,
-                task_handler, task_params, priority, timeout_seconds, retry_times,
-                last_execution_time, next_execution_time, execution_count, 
-                success_count, failure_count, created_by, created_at, updated_at
-            FROM {self.table_name}
-            WHERE task_key = :task_key
-            """
-            
-            result = db.execute(text(sql), {"task_key": task_key})
+            result = db.execute(self._GET_BY_KEY_STMT, {"task_key": task_key})
             row = result.fetchone()
             
             if row:
-                return self._format_task_config(row)
+                return self._format_task_config(row, serialize_times)
             return None
             
-        except Exception as e:
+        except SQLAlchemyError as e:
             logger.error(f"❌ 获取任务配置失败: {task_key}, {e}")
             return None
     
+    def _check_scheduled_query_plan(self, db: Session) -> None:
+        """
+        EXPLAIN 启用定时任务查询，未走索引范围扫描时输出警告
+        
+        task_type IN 两个取值时跨分支排序仍需 filesort（配置表行数很少，代价可忽略），只记调试日志；
+        
+        所需索引见 sql/2026-10-17/add_task_config_indexes.sql；仅在 DEBUG 日志级别下执行一次
+        """
+        self._plan_checked = True
+        try:
+            compiled = self._GET_ENABLED_SCHEDULED_STMT.compile(
+                dialect=db.get_bind().dialect, compile_kwargs={"literal_binds": True}
+            )
+            for plan in db.execute(text(f"EXPLAIN {compiled}")).mappings():
+                extra = plan.get("Extra") or ""
+                if plan.get("type") not in ("range", "ref"):
+                    logger.warning(
+                        f"⚠️ 启用定时任务查询未使用索引: type={plan.get('type')}, key={plan.get('key')}, "
+                        f"Extra={extra}；请执行 add_task_config_indexes.sql"
+                    )
+                elif "filesort" in extra:
+                    logger.debug(f"📝 启用定时任务查询使用索引 {plan.get('key')}，排序仍需 filesort")
+        except SQLAlchemyError as e:
+            logger.debug(f"📝 检查任务配置查询计划失败: {e}")
+    
     def get_enabled_scheduled_tasks(self, db: Session) -> List[Dict[str, Any]]:
-        """获取启用的定时任务"""
+        """获取启用的定时任务（结果缓存 LIST_CACHE_TTL 秒，写操作后失效）"""
+        cached = self._get_cached_list("enabled_scheduled")
+        if cached is not None:
+            return cached
+        
+        if not self._plan_checked and logger.isEnabledFor(logging.DEBUG):
+            self._check_scheduled_query_plan(db)
+        
         try:
-            sql = f"""
-            SELECT 
-                id, task_key, task_name, task_description, task_type, is_enabled,
-                schedule_interval, schedule_cron, max_concurrent, default_batch_size,
-                task_handler, task_params, priority, timeout_seconds, retry_times,
-                last_execution_time, next_execution_time, execution_count, 
-                success_count, failure_count, created_by, created_at, updated_at
-            FROM {self.table_name}
-            WHERE is_enabled = TRUE 
-            AND task_type IN ('scheduled', 'both')
-            ORDER BY priority ASC, task_name ASC
-            """
-            
-            result = db.execute(text(sql))
+            version = self._cache_version
+            result = db.execute(self._GET_ENABLED_SCHEDULED_STMT)
             
             tasks = []
             for row in result:
                 tasks.append(self._format_task_config(row))
             
+            self._store_cached_list("enabled_scheduled", version, tasks)
             return tasks
             
-        except Exception as e:
+        except SQLAlchemyError as e:
             logger.error(f"❌ 获取启用的定时任务失败: {e}")
             return []
     
     def update_task_enabled_status(self, db: Session, task_key: str, is_enabled: bool) -> bool:
         """更新任务启用状态"""
         try:
-            sql = f"""
-            UPDATE {self.table_name}
-            SET is_enabled = :is_enabled, updated_at = CURRENT_TIMESTAMP
-            WHERE task_key = :task_key
-            """
-            
-            result = db.execute(text(sql), {
-                "task_key": task_key,
+            result = db.execute(self._UPDATE_ENABLED_STMT, {
+                self.TASK_KEY_PARAM: task_key,
                 "is_enabled": is_enabled
             })
             db.commit()
+            self.invalidate_cache()
             
             if result.rowcount > 0:
                 status_text = "启用" if is_enabled else "禁用"
@@ -123,7 +338,7 @@ class TaskConfig:
                 logger.warning(f"⚠️ 任务不存在: {task_key}")
                 return False
                 
-        except Exception as e:
+        except SQLAlchemyError as e:
             logger.error(f"❌ 更新任务状态失败: {task_key}, {e}")
             db.rollback()
             return False
@@ -138,36 +353,18 @@ class TaskConfig:
     ) -> bool:
         """更新任务执行统计"""
         try:
-            update_fields = ["updated_at = CURRENT_TIMESTAMP"]
-            params = {"task_key": task_key}
+            params = {self.TASK_KEY_PARAM: task_key}
             
             if last_execution_time:
-                update_fields.append("last_execution_time = :last_execution_time")
                 params["last_execution_time"] = last_execution_time
             
             if next_execution_time:
-                update_fields.append("next_execution_time = :next_execution_time")
                 params["next_execution_time"] = next_execution_time
             
-            # 只有在success不为None时才更新计数
-            if success is not None:
-                # 更新执行次数
-                update_fields.append("execution_count = execution_count + 1")
-                
-                # 更新成功/失败次数
-                if success:
-                    update_fields.append("success_count = success_count + 1")
-                else:
-                    update_fields.append("failure_count = failure_count + 1")
-            
-            sql = f"""
-            UPDATE {self.table_name}
-            SET {', '.join(update_fields)}
-            WHERE task_key = :task_key
-            """
-            
-            result = db.execute(text(sql), params)
+            stmt = self._UPDATE_STATS_STMTS[(bool(last_execution_time), bool(next_execution_time), success)]
+            result = db.execute(stmt, params)
             db.commit()
+            self.invalidate_cache()
             
             if result.rowcount > 0:
                 status_msg = ""
@@ -181,11 +378,80 @@ class TaskConfig:
                 logger.warning(f"⚠️ 任务不存在: {task_key}")
                 return False
                 
-        except Exception as e:
+        except SQLAlchemyError as e:
             logger.error(f"❌ 更新任务执行统计失败: {task_key}, {e}")
             db.rollback()
             return False
     
+    def update_task_execution_stats_bulk(
+        self,
+        db: Session,
+        records: List[Tuple[str, Optional[datetime], Optional[datetime], Optional[bool]]]
+    ) -> int:
+        """
+        批量更新多个任务的执行统计：一条 UPDATE ... CASE task_key、一次提交
+        
+        Args:
+            records: (task_key, last_execution_time, next_execution_time, success) 列表，
+                各字段语义与 update_task_execution_stats 相同
+            
+        Returns:
+            匹配到的任务数，失败时为0
+        """
+        if not records:
+            return 0
+        
+        t = self.table
+        task_keys = [record[0] for record in records]
+        try:
+            last_whens: Dict[str, Any] = {}
+            next_whens: Dict[str, Any] = {}
+            executed_keys: List[str] = []
+            success_keys: List[str] = []
+            failure_keys: List[str] = []
+            
+            for task_key, last_execution_time, next_execution_time, success in records:
+                if last_execution_time:
+                    last_whens[task_key] = literal(last_execution_time, t.c.last_execution_time.type)
+                
+                if next_execution_time:
+                    next_whens[task_key] = literal(next_execution_time, t.c.next_execution_time.type)
+                
+                # 只有在success不为None时才更新计数
+                if success is not None:
+                    executed_keys.append(task_key)
+                    (success_keys if success else failure_keys).append(task_key)
+            
+            values: Dict[str, Any] = {"updated_at": func.current_timestamp()}
+            if last_whens:
+                values["last_execution_time"] = case(
+                    last_whens, value=t.c.task_key, else_=t.c.last_execution_time
+                )
+            if next_whens:
+                values["next_execution_time"] = case(
+                    next_whens, value=t.c.task_key, else_=t.c.next_execution_time
+                )
+            for column, keys in (
+                (t.c.execution_count, executed_keys),
+                (t.c.success_count, success_keys),
+                (t.c.failure_count, failure_keys),
+            ):
+                if keys:
+                    values[column.name] = column + case((t.c.task_key.in_(keys), 1), else_=0)
+            
+            stmt = update(t).where(t.c.task_key.in_(task_keys)).values(values)
+            result = db.execute(stmt)
+            db.commit()
+            self.invalidate_cache()
+            
+            logger.debug(f"📊 批量更新任务执行统计: {len(records)} 个任务")
+            return result.rowcount
+            
+        except SQLAlchemyError as e:
+            logger.error(f"❌ 批量更新任务执行统计失败: {task_keys}, {e}")
+            db.rollback()
+            return 0
+    
     def update_task_config(
         self,
         db: Session,
@@ -193,45 +459,33 @@ class TaskConfig:
         updates: Dict[str, Any]
     ) -> bool:
         """更新任务配置"""
+        if not updates:
+            return True
+        
+        params = {self.TASK_KEY_PARAM: task_key}
+        has_update = False
+        
+        for field in self._UPDATABLE_FIELDS:
+            if field in updates:
+                value = updates[field]
+                # 处理JSON字段
+                if field == 'task_params' and isinstance(value, dict):
+                    value = safe_json_dumps(value)
+                params[field] = value
+                params[f"set_{field}"] = True
+                has_update = True
+            else:
+                params[field] = None
+                params[f"set_{field}"] = False
+        
+        if not has_update:
+            logger.warning(f"⚠️ 没有有效的更新字段: {task_key}")
+            return False
+        
         try:
-            if not updates:
-                return True
-            
-            update_fields = []
-            params = {"task_key": task_key}
-            
-            # 允许更新的字段
-            allowed_fields = {
-                'task_name', 'task_description', 'task_type', 'is_enabled',
-                'schedule_interval', 'schedule_cron', 'max_concurrent', 
-                'default_batch_size', 'task_params', 'priority', 
-                'timeout_seconds', 'retry_times'
-            }
-            
-            for field, value in updates.items():
-                if field in allowed_fields:
-                    update_fields.append(f"{field} = :{field}")
-                    
-                    # 处理JSON字段
-                    if field == 'task_params' and isinstance(value, dict):
-                        params[field] = json.dumps(value, ensure_ascii=False)
-                    else:
-                        params[field] = value
-            
-            if not update_fields:
-                logger.warning(f"⚠️ 没有有效的更新字段: {task_key}")
-                return False
-            
-            update_fields.append("updated_at = CURRENT_TIMESTAMP")
-            
-            sql = f"""
-            UPDATE {self.table_name}
-            SET {', '.join(update_fields)}
-            WHERE task_key = :task_key
-            """
-            
-            result = db.execute(text(sql), params)
+            result = db.execute(self._UPDATE_CONFIG_STMT, params)
             db.commit()
+            self.invalidate_cache()
             
             if result.rowcount > 0:
                 logger.info(f"✅ 更新任务配置: {task_key}")
@@ -240,7 +494,7 @@ class TaskConfig:
                 logger.warning(f"⚠️ 任务不存在: {task_key}")
                 return False
                 
-        except Exception as e:
+        except SQLAlchemyError as e:
             logger.error(f"❌ 更新任务配置失败: {task_key}, {e}")
             db.rollback()
             return False
@@ -259,12 +513,6 @@ class TaskConfig:
     ) -> bool:
         """创建任务配置"""
         try:
-            # 检查任务是否已存在
-            existing = self.get_task_by_key(db, task_key)
-            if existing:
-                logger.warning(f"⚠️ 任务已存在: {task_key}")
-                return False
-            
             # 准备参数
             params = {
                 "task_key": task_key,
@@ -286,31 +534,27 @@ class TaskConfig:
             # 处理task_params
             task_params = kwargs.get("task_params", {})
             if task_params:
-                params["task_params"] = json.dumps(task_params, ensure_ascii=False)
+                params["task_params"] = safe_json_dumps(task_params)
             else:
                 params["task_params"] = None
             
-            sql = f"""
-            INSERT INTO {self.table_name} (
-                task_key, task_name, task_description, task_type, is_enabled,
-                schedule_interval, schedule_cron, max_concurrent, default_batch_size,
-                task_handler, task_params, priority, timeout_seconds, retry_times,
-                created_by, created_at, updated_at
-            ) VALUES (
-                :task_key, :task_name, :task_description, :task_type, :is_enabled,
-                :schedule_interval, :schedule_cron, :max_concurrent, :default_batch_size,
-                :task_handler, :task_params, :priority, :timeout_seconds, :retry_times,
-                :created_by, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP
-            )
-            """
-            
-            db.execute(text(sql), params)
+            # 不再预先查询是否存在：直接插入，由 task_key 唯一约束判重，省一次往返且无竞态
+            db.execute(self._CREATE_STMT, params)
             db.commit()
+            self.invalidate_cache()
             
             logger.info(f"✅ 创建任务配置: {task_key}")
             return True
             
-        except Exception as e:
+        except IntegrityError as e:
+            db.rollback()
+            if e.orig is not None and e.orig.args and e.orig.args[0] == self._DUPLICATE_ENTRY_ERRNO:
+                logger.warning(f"⚠️ 任务已存在: {task_key}")
+            else:
+                logger.error(f"❌ 创建任务配置失败: {task_key}, {e}")
+            return False
+            
+        except SQLAlchemyError as e:
             logger.error(f"❌ 创建任务配置失败: {task_key}, {e}")
             db.rollback()
             return False
@@ -318,10 +562,9 @@ class TaskConfig:
     def delete_task_config(self, db: Session, task_key: str) -> bool:
         """删除任务配置"""
         try:
-            sql = f"DELETE FROM {self.table_name} WHERE task_key = :task_key"
-            
-            result = db.execute(text(sql), {"task_key": task_key})
+            result = db.execute(self._DELETE_STMT, {"task_key": task_key})
             db.commit()
+            self.invalidate_cache()
             
             if result.rowcount > 0:
                 logger.info(f"✅ 删除任务配置: {task_key}")
@@ -330,7 +573,7 @@ class TaskConfig:
                 logger.warning(f"⚠️ 任务不存在: {task_key}")
                 return False
                 
-        except Exception as e:
+        except SQLAlchemyError as e:
             logger.error(f"❌ 删除任务配置失败: {task_key}, {e}")
             db.rollback()
             return False
@@ -341,90 +584,51 @@ class TaskConfig:
             if not current_time:
                 current_time = datetime.now()
             
-            sql = f"""
-            SELECT 
-                id, task_key, task_name, task_description, task_type, is_enabled,
-                schedule_interval, schedule_cron, max_concurrent, default_batch_size,
-                task_handler, task_params, priority, timeout_seconds, retry_times,
-                last_execution_time, next_execution_time, execution_count, 
-                success_count, failure_count, created_by, created_at, updated_at
-            FROM {self.table_name}
-            WHERE is_enabled = TRUE 
-            AND task_type IN ('scheduled', 'both')
-            AND (
-                next_execution_time IS NULL 
-                OR next_execution_time <= :current_time
-                OR last_execution_time IS NULL
-                OR TIMESTAMPDIFF(SECOND, last_execution_time, :current_time) >= schedule_interval
-            )
-            ORDER BY priority ASC, task_name ASC
-            """
-            
-            result = db.execute(text(sql), {"current_time": current_time})
-            
-            tasks = []
-            for row in result:
-                task_config = self._format_task_config(row)
-                
-                # 计算下次执行时间
-                if task_config["last_execution_time"]:
-                    last_time = datetime.fromisoformat(task_config["last_execution_time"].replace('Z', '+00:00'))
-                    next_time = last_time + timedelta(seconds=task_config["schedule_interval"])
-                    
-                    # 如果还没到执行时间，跳过
-                    if next_time > current_time:
-                        continue
-                
-                tasks.append(task_config)
+            result = db.execute(self._GET_DUE_STMT, {"current_time": current_time})
             
-            return tasks
+            # 供调度内部使用，时间字段保持 datetime，无需 isoformat 再解析回来
+            return [self._format_task_config(row, serialize_times=False) for row in result]
             
-        except Exception as e:
+        except SQLAlchemyError as e:
             logger.error(f"❌ 获取待执行任务失败: {e}")
             return []
     
-    def _format_task_config(self, row) -> Dict[str, Any]:
-        """格式化任务配置"""
-        try:
-            # 解析JSON字段
-            task_params = {}
-            if row.task_params:
-                try:
-                    task_params = json.loads(row.task_params)
-                except:
-                    task_params = {"raw": row.task_params}
-            
-            return {
-                "id": row.id,
-                "task_key": row.task_key,
-                "task_name": row.task_name,
-                "task_description": row.task_description,
-                "task_type": row.task_type,
-                "is_enabled": bool(row.is_enabled),
-                "status": "生效" if bool(row.is_enabled) else "不生效",  # 简化状态显示
-                "schedule_interval": row.schedule_interval,
-                "schedule_cron": row.schedule_cron,
-                "max_concurrent": row.max_concurrent,
-                "default_batch_size": row.default_batch_size,
-                "task_handler": row.task_handler,
-                "task_params": task_params,
-                "priority": row.priority,
-                "timeout_seconds": row.timeout_seconds,
-                "retry_times": row.retry_times,
-                "last_execution_time": row.last_execution_time.isoformat() if row.last_execution_time else None,
-                "next_execution_time": row.next_execution_time.isoformat() if row.next_execution_time else None,
-                "execution_count": row.execution_count,
-                "success_count": row.success_count,
-                "failure_count": row.failure_count,
-                # 移除了success_rate字段
-                "created_by": row.created_by,
-                "created_at": row.created_at.isoformat() if row.created_at else None,
-                "updated_at": row.updated_at.isoformat() if row.updated_at else None
-            }
-            
-        except Exception as e:
-            logger.error(f"❌ 格式化任务配置失败: {e}")
-            return {"error": "格式化失败"}
+    def _format_task_config(self, row, serialize_times: bool = True) -> Dict[str, Any]:
+        """
+        格式化任务配置
+        
+        serialize_times=True 时时间字段转为ISO字符串（API/JSON输出）；
+        内部调度调用传 False 保持 datetime
+        """
+        iso = (lambda dt: dt.isoformat() if dt else None) if serialize_times else (lambda dt: dt)
+        
+        return {
+            "id": row.id,
+            "task_key": row.task_key,
+            "task_name": row.task_name,
+            "task_description": row.task_description,
+            "task_type": row.task_type,
+            "is_enabled": row.is_enabled,
+            "status": row.status,  # 简化状态显示
+            "schedule_interval": row.schedule_interval,
+            "schedule_cron": row.schedule_cron,
+            "max_concurrent": row.max_concurrent,
+            "default_batch_size": row.default_batch_size,
+            "task_handler": row.task_handler,
+            "task_params": _load_task_params(row.task_params),
+            "priority": row.priority,
+            "timeout_seconds": row.timeout_seconds,
+            "retry_times": row.retry_times,
+            "last_execution_time": iso(row.last_execution_time),
+            "next_execution_time": iso(row.next_execution_time),
+            "execution_count": row.execution_count,
+            "success_count": row.success_count,
+            "failure_count": row.failure_count,
+            # 移除了success_rate字段
+            "created_by": row.created_by,
+            "created_at": iso(row.created_at),
+            "updated_at": iso(row.updated_at)
+        }
 
 
 # 全局任务配置实例
@@ -3,37 +3,88 @@ APScheduler 调度器服务 - 替代原有调度器实现
 """
 import asyncio
 import logging
+import os
+import queue
+import re
+import threading
+import time
+import weakref
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Any, List, Optional, Tuple
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from apscheduler.schedulers.base import STATE_RUNNING
 from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
 from apscheduler.executors.pool import ThreadPoolExecutor
+from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 from apscheduler.events import EVENT_JOB_EXECUTED, EVENT_JOB_ERROR, EVENT_JOB_MISSED
 from config.settings import settings
 from app.core.master_switch import master_switch
+from app.db.connection_manager import get_db_session
+from app.models.task import task_record
+from app.models.task_config import task_config
+from app.services.stage2_analysis_service import execute_batch_analysis_workflow
 
 logger = logging.getLogger(__name__)
 
 
+class _ForwardHandler(logging.Handler):
+    """把队列取出的日志记录交给模块日志记录器，沿用其处理器链输出"""
+    
+    def emit(self, record: logging.LogRecord) -> None:
+        logger.handle(record)
+
+
+# 作业事件监听器在执行器线程中调用，日志只入队，由 QueueListener 的线程写处理器，
+# 监听器不必等待日志处理器的锁和I/O，也不占用调度器所在的事件循环
+_event_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+_event_logger = logging.getLogger(f"{__name__}.events")
+_event_logger.addHandler(QueueHandler(_event_log_queue))
+_event_logger.propagate = False
+
+# 常用调度间隔的显示文字，与 _format_interval_display 的计算结果一致（14400 为任务配置表的默认间隔）
+_COMMON_INTERVAL_DISPLAY = {
+    60: "1分钟",
+    300: "5分钟",
+    1800: "30分钟",
+    3600: "1小时",
+    7200: "2小时",
+    14400: "4小时",
+    86400: "1天",
+}
+
+
 class APSchedulerService:
     """APScheduler 调度器服务"""
     
+    # 状态快照缓存有效期（秒）；前端轮询频繁，而作业在一秒内几乎不会变化
+    STATUS_CACHE_TTL = 1.0
+    
     def __init__(self):
         # 配置作业存储（使用现有数据库）
+        # 作业存储自建引擎，连接池参数与应用主引擎保持一致的保活/回收策略；
+        # pickle_protocol 默认即为 pickle.HIGHEST_PROTOCOL
         jobstores = {
             'default': SQLAlchemyJobStore(
                 url=settings.database_url, 
                 tablename='apscheduler_jobs',
-                metadata=None
+                metadata=None,
+                engine_options={
+                    'pool_size': settings.concurrency_scheduler_jobstore_pool_size,
+                    'max_overflow': 10,
+                    'pool_pre_ping': True,
+                    'pool_recycle': 3600,
+                }
             )
         }
         
-        # 🔥 优化：增加执行器的线程池大小，提升并发处理能力
-        import os
+        # 🔥 优化：执行器线程数可配置；每个作业线程内自建事件循环执行异步任务，
+        # 主要时间花在等待IO上，线程数按CPU核数适度放大即可，过多只会增加切换开销
         cpu_count = os.cpu_count() or 4
         
-        # 根据CPU核数和系统配置动态设置线程池大小
-        scheduler_workers = max(20, cpu_count * 3)  # 至少20个，或CPU核数的3倍
+        scheduler_workers = settings.concurrency_scheduler_workers or min(32, cpu_count * 2)
         
         # 配置执行器
         executors = {
@@ -42,12 +93,21 @@ class APSchedulerService:
         
         logger.info(f"🔧 APScheduler执行器配置: {scheduler_workers} 个线程 (CPU核数: {cpu_count})")
         
+        # 同时执行的批量分析流程上限：每个流程都会占用数据库连接和LLM并发额度，
+        # 执行器线程数只限制了线程，不足以防止任务执行慢于触发时积压。
+        # 作业在各自线程的独立事件循环中执行，因此用线程信号量而非 asyncio.Semaphore
+        max_executions = max(1, settings.concurrency_scheduler_max_concurrent_executions)
+        self._exec_sem = threading.BoundedSemaphore(max_executions)
+        self._max_executions = max_executions
+        
         # 作业默认配置
         job_defaults = {
-            'coalesce': False,  # 不合并作业
-            'max_instances': 3,  # 最大实例数
+            'coalesce': settings.concurrency_scheduler_coalesce,  # 默认合并错过的多次执行，恢复后只补跑一次
+            'max_instances': settings.concurrency_scheduler_max_instances,  # 默认同一任务不并发执行
             'misfire_grace_time': 30  # 允许30秒延迟
         }
+        # 达到并发执行上限时等待空位的最长时间，与允许的调度延迟一致
+        self._exec_wait_timeout = job_defaults['misfire_grace_time']
         
         # 创建调度器
         self.scheduler = AsyncIOScheduler(
@@ -57,23 +117,34 @@ class APSchedulerService:
             timezone='Asia/Shanghai'
         )
         
+        # 作业事件日志的输出线程，start() 时启动、stop() 时停止（停止前输出完队列中的记录）
+        self._event_log_listener = QueueListener(_event_log_queue, _ForwardHandler())
+        
         # 添加事件监听器
         self._setup_event_listeners()
         
         self._running = False
         self._job_configs = {}  # 缓存任务配置
+        # 触发器 (类型, 描述) 缓存，按作业ID索引；作业存储每次 get_jobs 都会反序列化出新的触发器对象，
+        # 不能按对象缓存。触发器只在作业注册/删除时变化，届时清除对应条目
+        self._trigger_desc_cache: Dict[str, Tuple[str, str]] = {}
+        # 已注册任务的触发器（注册时 add_job 返回的作业对象上取得），用于在内存中推算下次执行时间，
+        # 避免执行完成后再到作业存储查询作业
+        self._job_triggers: Dict[str, Any] = {}
+        # get_status 的状态快照：(生成时间, 总开关状态, 运行状态, 状态字典)；作业变更时置空
+        self._status_cache: Optional[Tuple[float, bool, bool, Dict[str, Any]]] = None
     
     def _setup_event_listeners(self):
         """设置事件监听器"""
         
         def job_executed(event):
-            logger.info(f"✅ 任务执行完成: {event.job_id}")
+            _event_logger.info(f"✅ 任务执行完成: {event.job_id}")
         
         def job_error(event):
-            logger.error(f"❌ 任务执行失败: {event.job_id}, 错误: {event.exception}")
+            _event_logger.error(f"❌ 任务执行失败: {event.job_id}, 错误: {event.exception}")
         
         def job_missed(event):
-            logger.warning(f"⚠️ 任务错过执行: {event.job_id}")
+            _event_logger.warning(f"⚠️ 任务错过执行: {event.job_id}")
         
         self.scheduler.add_listener(job_executed, EVENT_JOB_EXECUTED)
         self.scheduler.add_listener(job_error, EVENT_JOB_ERROR)
@@ -84,6 +155,7 @@ class APSchedulerService:
         if not self._running:
             try:
                 self.scheduler.start()
+                self._event_log_listener.start()
                 self._running = True
                 logger.info("🚀 APScheduler 调度器已启动")
                 
@@ -99,6 +171,7 @@ class APSchedulerService:
         if self._running:
             try:
                 self.scheduler.shutdown(wait=False)
+                self._event_log_listener.stop()
                 self._running = False
                 logger.info("⏹️ APScheduler 调度器已停止")
             except Exception as e:
@@ -107,109 +180,139 @@ class APSchedulerService:
     async def _load_and_register_tasks(self):
         """从数据库加载任务配置并注册到APScheduler"""
         try:
-            from app.db.connection_manager import get_db_session
-            from app.models.task_config import task_config
-            
             # 🔥 修复：使用连接管理器防止连接泄漏
             with get_db_session() as db:
                 # 获取所有启用的任务配置
                 configs = task_config.get_all_tasks(db, enabled_only=True)
                 
-                for config in configs:
-                    await self._register_task(config)
+                # 暂停调度后逐个注册，全部注册完成再恢复，调度器只重新计算一次唤醒时间；
+                # 注册时不同步执行时间，全部注册完成后用作业对象一次批量写入
+                jobs = await self._register_tasks(configs, db)
+                
+                self._sync_job_times(db, jobs)
                 
                 logger.info(f"📋 加载了 {len(configs)} 个启用任务")
                     
         except Exception as e:
             logger.error(f"❌ 加载任务配置失败: {e}")
     
-    async def _register_task(self, config: Dict[str, Any]):
-        """注册单个任务到APScheduler - 支持cron和interval两种触发器"""
+    def _build_job_kwargs(self, config: Dict[str, Any]) -> Tuple[Dict[str, Any], str]:
+        """
+        根据任务配置构建 add_job 参数 - 支持cron和interval两种触发器
+        
+        返回 (add_job 参数, 触发器描述)
+        """
+        task_key = config.get("task_key")
+        task_name = config.get("task_name", task_key)
+        schedule_cron = config.get("schedule_cron")
+        schedule_interval = config.get("schedule_interval", 3600)
+        
+        # 根据配置选择触发器类型
+        job_kwargs = {
+            'func': 'app.services.apscheduler_service:execute_scheduled_task',
+            'args': [task_key],
+            'id': task_key,
+            'name': task_name,
+            'replace_existing': True
+        }
+        
+        # 🚀 优先使用cron表达式，如果没有则使用interval
+        if schedule_cron and schedule_cron.strip():
+            # 使用cron触发器
+            try:
+                # 由APScheduler解析并校验整条表达式（字段数与各字段取值），无效时降级为interval
+                job_kwargs['trigger'] = CronTrigger.from_crontab(schedule_cron.strip(), timezone='Asia/Shanghai')
+                
+                trigger_desc = f"cron({schedule_cron})"
+                logger.info(f"➕ 注册CRON任务: {task_name} - {trigger_desc}")
+                
+            except Exception as e:
+                logger.error(f"❌ 无效的cron表达式: {schedule_cron}, 错误: {e}")
+                logger.info(f"🔄 降级使用interval触发器: {schedule_interval}秒")
+                # 降级到interval模式
+                job_kwargs['trigger'] = IntervalTrigger(seconds=schedule_interval, timezone=self.scheduler.timezone)
+                trigger_desc = f"每{schedule_interval}秒"
+        else:
+            # 使用interval触发器
+            job_kwargs['trigger'] = IntervalTrigger(seconds=schedule_interval, timezone=self.scheduler.timezone)
+            trigger_desc = f"每{schedule_interval}秒"
+            logger.info(f"➕ 注册间隔任务: {task_name} - {trigger_desc}")
+        
+        return job_kwargs, trigger_desc
+    
+    async def _register_tasks(self, configs: List[Dict[str, Any]], db) -> List[Any]:
+        """
+        批量注册任务：注册期间暂停调度器，完成后恢复
+        
+        各任务仍经 add_job 注册（触发作业添加事件、写入作业存储），暂停期间 add_job
+        不逐个唤醒调度器，恢复时统一唤醒一次。单个任务注册失败时跳过该任务
+        
+        返回注册成功的作业对象列表，供调用方批量同步下次执行时间
+        """
+        pause = self.scheduler.state == STATE_RUNNING
+        if pause:
+            self.scheduler.pause()
+        
+        jobs = []
+        try:
+            for config in configs:
+                job = await self._register_task(config, db, defer_sync=True)
+                if job is not None:
+                    jobs.append(job)
+        finally:
+            if pause:
+                self.scheduler.resume()
+        
+        return jobs
+    
+    async def _register_task(self, config: Dict[str, Any], db=None, defer_sync: bool = False):
+        """
+        注册单个任务到APScheduler - 支持cron和interval两种触发器
+        
+        db: 调用方已持有的会话，用于注册后同步下次执行时间；为空时单独开启会话
+        defer_sync: 为True时不在注册后同步下次执行时间，由调用方批量注册完成后统一同步
+        
+        返回注册得到的作业对象，注册失败时返回 None
+        """
         try:
             task_key = config.get("task_key")
-            task_name = config.get("task_name", task_key)
-            schedule_cron = config.get("schedule_cron")
-            schedule_interval = config.get("schedule_interval", 3600)
-            
-            # 根据配置选择触发器类型
-            job_kwargs = {
-                'func': 'app.services.apscheduler_service:execute_scheduled_task',
-                'args': [task_key],
-                'id': task_key,
-                'name': task_name,
-                'replace_existing': True
-            }
-            
-            # 🚀 优先使用cron表达式，如果没有则使用interval
-            if schedule_cron and schedule_cron.strip():
-                # 使用cron触发器
-                try:
-                    # 验证cron表达式格式（简单验证）
-                    cron_parts = schedule_cron.strip().split()
-                    if len(cron_parts) != 5:
-                        raise ValueError(f"cron表达式必须是5个字段: {schedule_cron}")
-                    
-                    minute, hour, day, month, day_of_week = cron_parts
-                    job_kwargs.update({
-                        'trigger': 'cron',
-                        'minute': minute,
-                        'hour': hour,
-                        'day': day,
-                        'month': month,
-                        'day_of_week': day_of_week,
-                        'timezone': 'Asia/Shanghai'
-                    })
-                    
-                    trigger_desc = f"cron({schedule_cron})"
-                    logger.info(f"➕ 注册CRON任务: {task_name} - {trigger_desc}")
-                    
-                except Exception as e:
-                    logger.error(f"❌ 无效的cron表达式: {schedule_cron}, 错误: {e}")
-                    logger.info(f"🔄 降级使用interval触发器: {schedule_interval}秒")
-                    # 降级到interval模式
-                    job_kwargs.update({
-                        'trigger': 'interval',
-                        'seconds': schedule_interval
-                    })
-                    trigger_desc = f"每{schedule_interval}秒"
-            else:
-                # 使用interval触发器
-                job_kwargs.update({
-                    'trigger': 'interval',
-                    'seconds': schedule_interval
-                })
-                trigger_desc = f"每{schedule_interval}秒"
-                logger.info(f"➕ 注册间隔任务: {task_name} - {trigger_desc}")
+            job_kwargs, _ = self._build_job_kwargs(config)
             
             # 注册任务到APScheduler
-            self.scheduler.add_job(**job_kwargs)
+            job = self.scheduler.add_job(**job_kwargs)
+            self._trigger_desc_cache.pop(task_key, None)
+            self._status_cache = None
+            self._job_triggers[task_key] = job.trigger
             
             # 缓存配置
             self._job_configs[task_key] = config
             
-            # 🔥 注册后立即同步下次执行时间到数据库（如果可能）
+            if defer_sync:
+                return job
+            
+            # 🔥 注册后立即同步下次执行时间到数据库（如果可能），优先复用调用方的会话
             try:
-                from app.db.connection_manager import get_db_session
-                
-                # 🔥 修复：使用连接管理器防止连接泄漏
-                with get_db_session() as db:
-                    await self._sync_single_task_time(db, task_key)
+                if db is not None:
+                    await self._sync_single_task_time(db, task_key, job)
+                else:
+                    # 🔥 修复：使用连接管理器防止连接泄漏
+                    with get_db_session() as own_db:
+                        await self._sync_single_task_time(own_db, task_key, job)
             except Exception as e:
                 logger.debug(f"注册任务时同步时间失败: {task_key}, {e}")
             
+            return job
+            
         except Exception as e:
             logger.error(f"❌ 注册任务失败: {config.get('task_key')}, {e}")
+            return None
     
     async def _execute_task(self, config: Dict[str, Any]):
         """执行具体任务"""
         task_key = config.get("task_key")
-        task_id = f"APS_{task_key}_{int(datetime.now().timestamp())}"
+        task_id = f"APS_{task_key}_{int(time.time())}"
         
         try:
-            from app.db.connection_manager import get_db_session
-            from app.models.task import task_record
-            from app.services.stage2_analysis_service import execute_batch_analysis_workflow
-            
             # 🔥 修复：使用连接管理器防止连接泄漏
             with get_db_session() as db:
                 # 创建任务记录
@@ -253,53 +356,65 @@ class APSchedulerService:
             
             # 更新失败统计
             try:
-                from app.db.connection_manager import get_db_session
                 # 🔥 修复：使用连接管理器防止连接泄漏
                 with get_db_session() as db:
                     await self._update_task_stats(db, task_key, success=False)
-            except:
-                pass
+            except Exception as stats_error:
+                logger.debug(f"更新失败统计失败: {task_key}, {stats_error}")
+    
+    def _get_next_run_time(self, task_key: str) -> Optional[datetime]:
+        """
+        获取任务的下次执行时间
+        
+        已注册且未暂停的任务用内存中的触发器推算，与调度器按同一触发器计算的结果一致，
+        不需要查询作业存储；未知或已暂停的任务回退到 get_job（暂停的作业没有下次执行时间）
+        """
+        try:
+            trigger = self._job_triggers.get(task_key)
+            if trigger is not None:
+                return trigger.get_next_fire_time(None, datetime.now(trigger.timezone))
+            
+            job = self.scheduler.get_job(task_key)
+            if job and job.next_run_time:
+                return job.next_run_time
+        except Exception as e:
+            logger.debug(f"获取下次执行时间失败: {task_key}, {e}")
+        return None
     
     async def _update_task_stats(self, db, task_key: str, success: bool):
         """更新任务执行统计"""
         try:
-            from app.models.task_config import task_config
+            # 🔥 获取APScheduler中任务的下次执行时间
+            next_run_time = self._get_next_run_time(task_key)
             
-            # 获取当前配置
-            config = task_config.get_task_by_key(db, task_key)
-            if config:
-                execution_count = config.get("execution_count", 0) + 1
-                
-                if success:
-                    success_count = config.get("success_count", 0) + 1
-                    failure_count = config.get("failure_count", 0)
-                else:
-                    success_count = config.get("success_count", 0)
-                    failure_count = config.get("failure_count", 0) + 1
-                
-                # 🔥 获取APScheduler中任务的下次执行时间
-                next_run_time = None
-                try:
-                    job = self.scheduler.get_job(task_key)
-                    if job and job.next_run_time:
-                        next_run_time = job.next_run_time
-                except:
-                    pass
-                
-                # 🔥 使用专门的执行统计更新方法，支持时间同步
-                success_update = task_config.update_task_execution_stats(
-                    db=db,
-                    task_key=task_key,
-                    last_execution_time=datetime.now(),
-                    next_execution_time=next_run_time,
-                    success=success
-                )
+            # 🔥 使用专门的执行统计更新方法，支持时间同步；计数在SQL中自增，无需先查询当前值
+            last_execution_time = datetime.now()
+            success_update = task_config.update_task_execution_stats(
+                db=db,
+                task_key=task_key,
+                last_execution_time=last_execution_time,
+                next_execution_time=next_run_time,
+                success=success
+            )
+            
+            if success_update:
+                next_time_str = next_run_time.isoformat() if next_run_time else "无"
                 
-                if success_update:
-                    next_time_str = next_run_time.isoformat() if next_run_time else "无"
-                    logger.debug(f"📊 更新任务统计: {task_key}, 成功:{success_count}, 失败:{failure_count}, 下次执行:{next_time_str}")
+                # 同步内存缓存中的计数与时间（注册时从数据库加载，之后只在这里累加）
+                self._status_cache = None
+                config = self._job_configs.get(task_key)
+                if config is not None:
+                    config["execution_count"] = (config.get("execution_count") or 0) + 1
+                    counter = "success_count" if success else "failure_count"
+                    config[counter] = (config.get(counter) or 0) + 1
+                    config["last_execution_time"] = last_execution_time.isoformat()
+                    if next_run_time:
+                        config["next_execution_time"] = next_time_str
+                    logger.debug(f"📊 更新任务统计: {task_key}, 成功:{config.get('success_count')}, 失败:{config.get('failure_count')}, 下次执行:{next_time_str}")
                 else:
-                    logger.warning(f"⚠️ 更新任务统计失败: {task_key}")
+                    logger.debug(f"📊 更新任务统计: {task_key}, 下次执行:{next_time_str}")
+            else:
+                logger.warning(f"⚠️ 更新任务统计失败: {task_key}")
                 
         except Exception as e:
             logger.error(f"❌ 更新任务统计失败: {task_key}, {e}")
@@ -316,6 +431,8 @@ class APSchedulerService:
                 replace_existing=True,
                 **kwargs
             )
+            self._trigger_desc_cache.pop(job_id, None)
+            self._status_cache = None
             logger.info(f"➕ 添加间隔任务: {job_id} (每{seconds}秒)")
         except Exception as e:
             logger.error(f"❌ 添加间隔任务失败: {job_id}, {e}")
@@ -323,27 +440,24 @@ class APSchedulerService:
     def add_cron_job(self, func, cron_expression: str, job_id: str, name: str = None, **kwargs):
         """添加CRON任务"""
         try:
-            # 解析CRON表达式
-            parts = cron_expression.split()
-            if len(parts) == 5:
-                minute, hour, day, month, day_of_week = parts
-                
-                self.scheduler.add_job(
-                    func=func,
-                    trigger='cron',
-                    minute=minute,
-                    hour=hour,
-                    day=day,
-                    month=month,
-                    day_of_week=day_of_week,
-                    id=job_id,
-                    name=name or job_id,
-                    replace_existing=True,
-                    **kwargs
-                )
-                logger.info(f"➕ 添加CRON任务: {job_id} ({cron_expression})")
-            else:
-                logger.error(f"❌ 无效的CRON表达式: {cron_expression}")
+            # 解析CRON表达式（未指定时区时沿用调度器时区）
+            try:
+                trigger = CronTrigger.from_crontab(cron_expression, timezone=self.scheduler.timezone)
+            except ValueError as e:
+                logger.error(f"❌ 无效的CRON表达式: {cron_expression}, {e}")
+                return
+            
+            self.scheduler.add_job(
+                func=func,
+                trigger=trigger,
+                id=job_id,
+                name=name or job_id,
+                replace_existing=True,
+                **kwargs
+            )
+            self._trigger_desc_cache.pop(job_id, None)
+            self._status_cache = None
+            logger.info(f"➕ 添加CRON任务: {job_id} ({cron_expression})")
         except Exception as e:
             logger.error(f"❌ 添加CRON任务失败: {job_id}, {e}")
     
@@ -353,6 +467,9 @@ class APSchedulerService:
             self.scheduler.remove_job(job_id)
             if job_id in self._job_configs:
                 del self._job_configs[job_id]
+            self._trigger_desc_cache.pop(job_id, None)
+            self._status_cache = None
+            self._job_triggers.pop(job_id, None)
             logger.info(f"➖ 删除任务: {job_id}")
         except Exception as e:
             logger.warning(f"删除任务失败: {job_id}, {e}")
@@ -361,6 +478,9 @@ class APSchedulerService:
         """暂停任务"""
         try:
             self.scheduler.pause_job(job_id)
+            self._status_cache = None
+            # 暂停期间没有下次执行时间，不能再按触发器推算；恢复时放回
+            self._job_triggers.pop(job_id, None)
             logger.info(f"⏸️ 暂停任务: {job_id}")
         except Exception as e:
             logger.error(f"❌ 暂停任务失败: {job_id}, {e}")
@@ -368,7 +488,11 @@ class APSchedulerService:
     def resume_job(self, job_id: str):
         """恢复任务"""
         try:
-            self.scheduler.resume_job(job_id)
+            job = self.scheduler.resume_job(job_id)
+            self._status_cache = None
+            # 只有注册的任务配置才用触发器推算下次执行时间；调度已结束的作业会被删除（返回 None）
+            if job is not None and job_id in self._job_configs:
+                self._job_triggers[job_id] = job.trigger
             logger.info(f"▶️ 恢复任务: {job_id}")
         except Exception as e:
             logger.error(f"❌ 恢复任务失败: {job_id}, {e}")
@@ -391,27 +515,46 @@ class APSchedulerService:
         return None
     
     def get_status(self) -> Dict[str, Any]:
-        """获取调度器状态（保持与原有接口兼容）"""
+        """
+        获取调度器状态（保持与原有接口兼容）
+        
+        结果缓存 STATUS_CACHE_TTL 秒，总开关或运行状态变化、作业增删改时立即失效；
+        每次返回缓存字典的浅拷贝，调用方增删顶层键不会影响其他调用方
+        """
+        # 总开关状态在本次调用内只读取一次，各任务共用
+        switch_enabled = master_switch.enabled
+        now = time.monotonic()
+        cached = self._status_cache
+        if (cached is not None and now - cached[0] < self.STATUS_CACHE_TTL
+                and cached[1] == switch_enabled and cached[2] == self._running):
+            return dict(cached[3])
+        
         jobs = self.get_jobs()
+        is_running = self._running and switch_enabled
+        task_status = "生效" if switch_enabled else "总开关关闭"
         
         # 🔥 智能状态检查：总开关开启但APScheduler未运行时自动修复
         needs_restart = False
-        if master_switch.enabled and not self._running:
+        if switch_enabled and not self._running:
             needs_restart = True
             logger.warning("🔧 检测到总开关已开启但APScheduler未运行，标记为需要重启")
         
         # 构建任务状态
         configured_tasks = {}
+        get_config = self._job_configs.get
         for job in jobs:
-            config = self._job_configs.get(job.id, {})
-            trigger_type, trigger_desc = self._analyze_trigger(job.trigger)
+            config = get_config(job.id, {})
+            trigger_info = self._trigger_desc_cache.get(job.id)
+            if trigger_info is None:
+                trigger_info = self._trigger_desc_cache[job.id] = self._analyze_trigger(job.trigger)
+            trigger_type, trigger_desc = trigger_info
             
             # 🔥 使用APScheduler的实时时间，而不是缓存的配置时间
             next_execution_time = job.next_run_time.isoformat() if job.next_run_time else None
             
             configured_tasks[job.id] = {
                 "task_name": job.name,
-                "status": "生效" if master_switch.enabled else "总开关关闭",
+                "status": task_status,
                 "is_enabled": True,  # APScheduler中的任务都是启用的
                 "trigger_type": trigger_type,  # 🚀 新增：触发器类型（cron/interval）
                 "trigger_description": trigger_desc,  # 🚀 新增：触发器描述
@@ -433,11 +576,11 @@ class APSchedulerService:
             diagnosis_status = "needs_restart"
             diagnosis_message = "总开关已开启但调度器未运行，建议重启调度器"
         
-        return {
-            "is_running": self._running and master_switch.enabled,
+        status = {
+            "is_running": is_running,
             "scheduler_enabled": True,
-            "master_switch_enabled": master_switch.enabled,
-            "effective_status": "running" if (self._running and master_switch.enabled) else "stopped",
+            "master_switch_enabled": switch_enabled,
+            "effective_status": "running" if is_running else "stopped",
             "current_time": datetime.now().isoformat(),
             "scheduler_type": "apscheduler_driven",
             "check_interval": 60,  # APScheduler自动管理
@@ -468,13 +611,15 @@ class APSchedulerService:
                 "needs_restart": needs_restart  # 🔥 新增：是否需要重启标志
             }
         }
+        self._status_cache = (now, switch_enabled, self._running, status)
+        return dict(status)
     
     def _extract_interval_from_trigger(self, trigger) -> int:
         """从触发器提取间隔时间（秒）"""
         try:
             if hasattr(trigger, 'interval'):
                 return int(trigger.interval.total_seconds())
-        except:
+        except (AttributeError, TypeError, ValueError):
             pass
         return 3600  # 默认1小时
     
@@ -486,18 +631,14 @@ class APSchedulerService:
             if 'cron' in trigger_name:
                 # CRON触发器
                 try:
-                    # 尝试重构cron表达式
-                    fields = []
-                    for field_name in ['minute', 'hour', 'day', 'month', 'day_of_week']:
-                        field = getattr(trigger, field_name, None)
-                        if field is not None:
-                            fields.append(str(field))
-                        else:
-                            fields.append('*')
-                    
-                    cron_expr = ' '.join(fields)
+                    # 尝试重构cron表达式（CronTrigger 的各字段保存在 trigger.fields 中）
+                    trigger_fields = {field.name: str(field) for field in getattr(trigger, 'fields', ())}
+                    cron_expr = ' '.join(
+                        trigger_fields.get(field_name, '*')
+                        for field_name in ('minute', 'hour', 'day', 'month', 'day_of_week')
+                    )
                     return 'cron', f"CRON: {cron_expr}"
-                except:
+                except Exception:
                     return 'cron', "CRON触发器"
                     
             elif 'interval' in trigger_name:
@@ -507,7 +648,7 @@ class APSchedulerService:
                         seconds = int(trigger.interval.total_seconds())
                         return 'interval', f"每{self._format_interval_display(seconds)}"
                     return 'interval', "间隔触发器"
-                except:
+                except Exception:
                     return 'interval', "间隔触发器"
                     
             else:
@@ -519,6 +660,10 @@ class APSchedulerService:
     
     def _format_interval_display(self, seconds: int) -> str:
         """格式化间隔时间显示"""
+        display = _COMMON_INTERVAL_DISPLAY.get(seconds)
+        if display is not None:
+            return display
+        
         if seconds < 60:
             return f"{seconds}秒"
         elif seconds < 3600:
@@ -535,9 +680,12 @@ class APSchedulerService:
         """重新加载任务配置"""
         logger.info("🔄 重新加载任务配置")
         
-        # 清除现有任务
-        for job in self.get_jobs():
-            self.remove_job(job.id)
+        # 清除现有任务：作业存储一次性删除全部作业，无需逐个 remove_job
+        self.scheduler.remove_all_jobs()
+        self._job_configs.clear()
+        self._trigger_desc_cache.clear()
+        self._status_cache = None
+        self._job_triggers.clear()
         
         # 重新加载
         await self._load_and_register_tasks()
@@ -547,14 +695,11 @@ class APSchedulerService:
         try:
             if enabled:
                 # 从数据库重新加载配置并注册
-                from app.db.connection_manager import get_db_session
-                from app.models.task_config import task_config
-                
                 # 🔥 修复：使用连接管理器防止连接泄漏
                 with get_db_session() as db:
                     config = task_config.get_task_by_key(db, task_key)
                     if config and config.get("is_enabled"):
-                        await self._register_task(config)
+                        await self._register_task(config, db)
                         return True
             else:
                 # 暂停任务
@@ -569,9 +714,6 @@ class APSchedulerService:
     async def update_task_config(self, task_key: str, updates: Dict[str, Any]) -> bool:
         """更新任务配置并重新注册到APScheduler"""
         try:
-            from app.db.connection_manager import get_db_session
-            from app.models.task_config import task_config
-            
             # 🔥 修复：使用连接管理器防止连接泄漏
             with get_db_session() as db:
                 # 更新数据库中的任务配置
@@ -583,12 +725,9 @@ class APSchedulerService:
                     if config and config.get("is_enabled"):
                         # 删除旧任务
                         self.remove_job(task_key)
-                        # 重新注册新任务
-                        await self._register_task(config)
+                        # 重新注册新任务（注册时已用同一会话同步下次执行时间到数据库）
+                        await self._register_task(config, db)
                         logger.info(f"🔄 任务配置已更新并重新注册: {task_key}")
-                        
-                        # 🔥 自动同步下次执行时间到数据库
-                        await self._sync_single_task_time(db, task_key)
                     
                     return True
                     
@@ -597,15 +736,17 @@ class APSchedulerService:
             
         return False
     
-    async def _sync_single_task_time(self, db, task_key: str):
-        """同步单个任务的执行时间到数据库"""
+    async def _sync_single_task_time(self, db, task_key: str, job=None):
+        """
+        同步单个任务的执行时间到数据库
+        
+        job: 调用方已持有的作业对象（如 add_job 的返回值），为空时从调度器查询
+        """
         try:
-            from app.models.task_config import task_config
-            from datetime import datetime
-            
             # 获取APScheduler中任务的下次执行时间
-            job = self.scheduler.get_job(task_key)
-            if job and job.next_run_time:
+            if job is None:
+                job = self.scheduler.get_job(task_key)
+            if job and getattr(job, 'next_run_time', None):
                 # 🔥 使用专门的执行统计更新方法，而不是通用的配置更新方法
                 success = task_config.update_task_execution_stats(
                     db=db,
@@ -627,33 +768,45 @@ class APSchedulerService:
         except Exception as e:
             logger.warning(f"⚠️ 同步单个任务时间失败: {task_key}, {e}")
     
+    def _sync_job_times(self, db, jobs) -> int:
+        """
+        批量同步多个任务的下次执行时间到数据库，并更新内存缓存
+        
+        返回数据库中匹配到的任务数
+        """
+        # 调度器未启动时 add_job 返回的待定作业还没有 next_run_time 属性
+        records = [
+            (job.id, None, job.next_run_time, None)
+            for job in jobs
+            if getattr(job, 'next_run_time', None)
+        ]
+        
+        if len(records) == 1:
+            task_key, _, next_run_time, _ = records[0]
+            synced_count = int(task_config.update_task_execution_stats(
+                db=db,
+                task_key=task_key,
+                next_execution_time=next_run_time
+            ))
+        else:
+            # 🔥 所有任务的下次执行时间合并为一条 UPDATE ... CASE，一次往返、一次提交
+            synced_count = task_config.update_task_execution_stats_bulk(db, records)
+        
+        for task_key, _, next_run_time, _ in records:
+            next_execution_time = next_run_time.isoformat()
+            if task_key in self._job_configs:
+                self._job_configs[task_key]["next_execution_time"] = next_execution_time
+            logger.debug(f"📊 同步任务时间: {task_key} -> {next_execution_time}")
+        
+        return synced_count
+    
     async def sync_all_task_times(self):
         """同步所有任务的执行时间到数据库"""
         try:
-            from app.db.connection_manager import get_db_session
-            from app.models.task_config import task_config
-            
             # 🔥 修复：使用连接管理器防止连接泄漏
             with get_db_session() as db:
                 jobs = self.get_jobs()
-                synced_count = 0
-                
-                for job in jobs:
-                    try:
-                        if job.next_run_time:
-                            # 🔥 使用专门的执行统计更新方法
-                            success = task_config.update_task_execution_stats(
-                                db=db,
-                                task_key=job.id,
-                                next_execution_time=job.next_run_time
-                            )
-                            
-                            if success:
-                                synced_count += 1
-                                next_execution_time = job.next_run_time.isoformat()
-                                logger.debug(f"📊 同步任务时间: {job.id} -> {next_execution_time}")
-                    except Exception as e:
-                        logger.warning(f"⚠️ 同步任务时间失败: {job.id}, {e}")
+                synced_count = self._sync_job_times(db, jobs)
                 
                 logger.info(f"🔄 同步完成: {synced_count}/{len(jobs)} 个任务时间已更新")
                 return synced_count
@@ -669,6 +822,49 @@ apscheduler_service = APSchedulerService()
 
 # ======================== CRON表达式工具函数 ========================
 
+# cron 各字段 (名称, 最小值, 最大值)，按表达式中的顺序排列
+_CRON_FIELD_SPECS = (
+    ("分钟", 0, 59),
+    ("小时", 0, 23),
+    ("日", 1, 31),
+    ("月", 1, 12),
+    ("周几", 0, 6),
+)
+
+# cron 字段的各种写法，均按整串匹配（fullmatch）
+_CRON_NUMBER = re.compile(r'\d+')
+_CRON_RANGE = re.compile(r'(\d+)-(\d+)')
+_CRON_STEP = re.compile(r'(\*|\d+)/(\d+)')
+_CRON_LIST = re.compile(r'\d+(?:,\d+)+')
+
+
+@lru_cache(maxsize=512)
+def _parse_cron_expression(cron_expr: str) -> Tuple[Optional[CronTrigger], str]:
+    """
+    校验cron表达式并构建触发器（结果与当前时间无关，按表达式缓存）
+    
+    返回: (CronTrigger, "") 或 (None, 错误信息)；入参须已 strip
+    """
+    parts = cron_expr.split()
+    
+    if len(parts) != 5:
+        return None, f"cron表达式必须包含5个字段 (分 时 日 月 周)，当前有{len(parts)}个字段"
+    
+    # 基本字段验证，遇到第一个无效字段即返回
+    for field, (field_name, min_val, max_val) in zip(parts, _CRON_FIELD_SPECS):
+        validation = _validate_cron_field(field, min_val, max_val, field_name)
+        if not validation["valid"]:
+            return None, validation["message"]
+    
+    # 用与注册任务相同的 CronTrigger.from_crontab 构建触发器，确保校验结果与实际注册一致
+    try:
+        trigger = CronTrigger.from_crontab(cron_expr, timezone='Asia/Shanghai')
+    except Exception as e:
+        return None, f"cron表达式语法错误: {str(e)}"
+    
+    return trigger, ""
+
+
 def validate_cron_expression(cron_expr: str) -> Dict[str, Any]:
     """
     验证cron表达式格式
@@ -679,126 +875,115 @@ def validate_cron_expression(cron_expr: str) -> Dict[str, Any]:
             return {"valid": False, "message": "cron表达式不能为空"}
         
         cron_expr = cron_expr.strip()
-        parts = cron_expr.split()
-        
-        if len(parts) != 5:
-            return {
-                "valid": False, 
-                "message": f"cron表达式必须包含5个字段 (分 时 日 月 周)，当前有{len(parts)}个字段"
-            }
+        trigger, message = _parse_cron_expression(cron_expr)
+        if trigger is None:
+            return {"valid": False, "message": message}
         
-        minute, hour, day, month, day_of_week = parts
-        
-        # 基本字段验证
-        validations = [
-            _validate_cron_field(minute, 0, 59, "分钟"),
-            _validate_cron_field(hour, 0, 23, "小时"),
-            _validate_cron_field(day, 1, 31, "日"),
-            _validate_cron_field(month, 1, 12, "月"),
-            _validate_cron_field(day_of_week, 0, 6, "周几")
-        ]
-        
-        for validation in validations:
-            if not validation["valid"]:
-                return validation
+        # 获取接下来的3次执行时间作为示例（依赖当前时间，不缓存）
+        now = datetime.now()
+        next_runs = []
+        for i in range(3):
+            next_run = trigger.get_next_fire_time(now, now)
+            if next_run:
+                next_runs.append(next_run.strftime('%Y-%m-%d %H:%M:%S'))
+                now = next_run
+            else:
+                break
         
-        # 尝试创建APScheduler CronTrigger来验证
-        try:
-            from apscheduler.triggers.cron import CronTrigger
-            from datetime import datetime
-            
-            trigger = CronTrigger(
-                minute=minute,
-                hour=hour,
-                day=day,
-                month=month,
-                day_of_week=day_of_week,
-                timezone='Asia/Shanghai'
-            )
-            
-            # 获取接下来的3次执行时间作为示例
-            now = datetime.now()
-            next_runs = []
-            for i in range(3):
-                next_run = trigger.get_next_fire_time(now, now)
-                if next_run:
-                    next_runs.append(next_run.strftime('%Y-%m-%d %H:%M:%S'))
-                    now = next_run
-                else:
-                    break
-            
-            return {
-                "valid": True,
-                "message": "cron表达式格式正确",
-                "next_runs": next_runs,
-                "description": _describe_cron_expression(cron_expr)
-            }
-            
-        except Exception as e:
-            return {"valid": False, "message": f"cron表达式语法错误: {str(e)}"}
+        return {
+            "valid": True,
+            "message": "cron表达式格式正确",
+            "next_runs": next_runs,
+            "description": _describe_cron_expression(cron_expr)
+        }
             
     except Exception as e:
         return {"valid": False, "message": f"验证失败: {str(e)}"}
 
 def _validate_cron_field(field: str, min_val: int, max_val: int, field_name: str) -> Dict[str, Any]:
     """验证单个cron字段"""
-    try:
-        if field == '*':
-            return {"valid": True}
-        
-        # 处理范围 (如 1-5)
-        if '-' in field:
-            try:
-                start, end = field.split('-')
-                start, end = int(start), int(end)
-                if start < min_val or end > max_val or start > end:
-                    return {"valid": False, "message": f"{field_name}范围无效: {field}"}
-                return {"valid": True}
-            except:
-                return {"valid": False, "message": f"{field_name}范围格式错误: {field}"}
-        
-        # 处理步长 (如 */5)
-        if '/' in field:
-            try:
-                base, step = field.split('/')
-                if base != '*':
-                    base_val = int(base)
-                    if base_val < min_val or base_val > max_val:
-                        return {"valid": False, "message": f"{field_name}基值超出范围: {base}"}
-                step_val = int(step)
-                if step_val <= 0:
-                    return {"valid": False, "message": f"{field_name}步长必须大于0: {step}"}
-                return {"valid": True}
-            except:
-                return {"valid": False, "message": f"{field_name}步长格式错误: {field}"}
-        
-        # 处理列表 (如 1,3,5)
-        if ',' in field:
-            try:
-                values = [int(x.strip()) for x in field.split(',')]
-                for val in values:
-                    if val < min_val or val > max_val:
-                        return {"valid": False, "message": f"{field_name}值超出范围: {val}"}
-                return {"valid": True}
-            except:
-                return {"valid": False, "message": f"{field_name}列表格式错误: {field}"}
-        
-        # 处理单个数值
-        try:
-            val = int(field)
+    if field == '*':
+        return {"valid": True}
+    
+    # 处理单个数值
+    if _CRON_NUMBER.fullmatch(field):
+        val = int(field)
+        if val < min_val or val > max_val:
+            return {"valid": False, "message": f"{field_name}值超出范围({min_val}-{max_val}): {val}"}
+        return {"valid": True}
+    
+    # 处理范围 (如 1-5)
+    match = _CRON_RANGE.fullmatch(field)
+    if match:
+        start, end = int(match[1]), int(match[2])
+        if start < min_val or end > max_val or start > end:
+            return {"valid": False, "message": f"{field_name}范围无效: {field}"}
+        return {"valid": True}
+    
+    # 处理步长 (如 */5)
+    match = _CRON_STEP.fullmatch(field)
+    if match:
+        base, step = match[1], match[2]
+        if base != '*':
+            base_val = int(base)
+            if base_val < min_val or base_val > max_val:
+                return {"valid": False, "message": f"{field_name}基值超出范围: {base}"}
+        if int(step) <= 0:
+            return {"valid": False, "message": f"{field_name}步长必须大于0: {step}"}
+        return {"valid": True}
+    
+    # 处理列表 (如 1,3,5)
+    if _CRON_LIST.fullmatch(field):
+        for val in map(int, field.split(',')):
             if val < min_val or val > max_val:
-                return {"valid": False, "message": f"{field_name}值超出范围({min_val}-{max_val}): {val}"}
-            return {"valid": True}
-        except:
-            return {"valid": False, "message": f"{field_name}数值格式错误: {field}"}
-            
-    except Exception as e:
-        return {"valid": False, "message": f"{field_name}验证失败: {str(e)}"}
+                return {"valid": False, "message": f"{field_name}值超出范围: {val}"}
+        return {"valid": True}
+    
+    # 都不匹配：按字段中出现的分隔符给出对应的格式错误
+    if '-' in field:
+        return {"valid": False, "message": f"{field_name}范围格式错误: {field}"}
+    if '/' in field:
+        return {"valid": False, "message": f"{field_name}步长格式错误: {field}"}
+    if ',' in field:
+        return {"valid": False, "message": f"{field_name}列表格式错误: {field}"}
+    return {"valid": False, "message": f"{field_name}数值格式错误: {field}"}
+
+_CRON_WEEKDAYS = ('周日', '周一', '周二', '周三', '周四', '周五', '周六')
+
+
+def _describe_cron_hour(hour: str) -> Optional[str]:
+    if '-' in hour and ',' not in hour:
+        return f"在{hour}点之间"
+    return f"在{hour}点"
+
+
+def _describe_cron_day_of_week(day_of_week: str) -> Optional[str]:
+    # isdigit 已保证非负，每个值只解析一次
+    if ',' in day_of_week:
+        days = [_CRON_WEEKDAYS[n] for d in day_of_week.split(',') if d.isdigit() and (n := int(d)) <= 6]
+        return f"在{','.join(days)}"
+    if day_of_week.isdigit() and (n := int(day_of_week)) <= 6:
+        return f"在{_CRON_WEEKDAYS[n]}"
+    return None
+
+
+# 小时/日/月/周几字段的描述函数（按 cron 字段顺序），字段为 * 时不描述；返回 None 表示该字段无法描述
+_CRON_DESCRIBERS = (
+    (1, _describe_cron_hour),
+    (2, lambda day: f"每月{day}号"),
+    (3, lambda month: f"在{month}月"),
+    (4, _describe_cron_day_of_week),
+)
 
+
+@lru_cache(maxsize=512)
 def _describe_cron_expression(cron_expr: str) -> str:
     """生成cron表达式的中文描述"""
     try:
-        minute, hour, day, month, day_of_week = cron_expr.split()
+        fields = cron_expr.split()
+        if len(fields) != 5:
+            return "自定义时间执行"
+        minute, hour = fields[0], fields[1]
         
         # 简单的描述逻辑
         descriptions = []
@@ -808,46 +993,82 @@ def _describe_cron_expression(cron_expr: str) -> str:
         elif minute != '*':
             descriptions.append(f"第{minute}分钟")
         
-        if hour != '*':
-            if ',' in hour:
-                descriptions.append(f"在{hour}点")
-            elif '-' in hour:
-                descriptions.append(f"在{hour}点之间")
-            else:
-                descriptions.append(f"在{hour}点")
-        
-        if day != '*':
-            descriptions.append(f"每月{day}号")
-        
-        if month != '*':
-            descriptions.append(f"在{month}月")
-        
-        if day_of_week != '*':
-            weekdays = ['周日', '周一', '周二', '周三', '周四', '周五', '周六']
-            if ',' in day_of_week:
-                days = [weekdays[int(d)] for d in day_of_week.split(',') if d.isdigit() and 0 <= int(d) <= 6]
-                descriptions.append(f"在{','.join(days)}")
-            elif day_of_week.isdigit() and 0 <= int(day_of_week) <= 6:
-                descriptions.append(f"在{weekdays[int(day_of_week)]}")
+        for index, describe in _CRON_DESCRIBERS:
+            value = fields[index]
+            if value != '*' and (description := describe(value)) is not None:
+                descriptions.append(description)
         
         if not descriptions:
             return "每分钟执行"
         
         return " ".join(descriptions) + "执行"
         
-    except:
+    except Exception:
         return "自定义时间执行"
 
 # ======================== 可序列化的任务执行函数 ========================
 
+# 执行器线程各自复用的事件循环
+_executor_thread_state = threading.local()
+
+
+def _cancel_pending_tasks(loop: asyncio.AbstractEventLoop):
+    """取消循环中遗留的任务并等待其结束，避免上一次执行的后台任务和回调带入下一次执行"""
+    pending = asyncio.all_tasks(loop)
+    if not pending:
+        return
+    for task in pending:
+        task.cancel()
+    loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+
+
+def _close_executor_loop(loop: asyncio.AbstractEventLoop):
+    """关闭执行器线程的事件循环：取消遗留任务、结束异步生成器后关闭"""
+    if loop.is_closed() or loop.is_running():
+        return
+    try:
+        _cancel_pending_tasks(loop)
+        loop.run_until_complete(loop.shutdown_asyncgens())
+    except Exception as e:
+        logger.debug(f"关闭执行器事件循环失败: {e}")
+    finally:
+        loop.close()
+
+
+class _ExecutorLoop:
+    """
+    执行器线程的事件循环持有者，保存在线程局部数据中
+    
+    执行器关闭、线程退出时随线程局部数据一起回收，由 finalize 关闭其事件循环；
+    解释器退出时尚未回收的也会被关闭
+    """
+    __slots__ = ("loop", "__weakref__")
+    
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        weakref.finalize(self, _close_executor_loop, self.loop)
+
+
+def _get_executor_loop() -> asyncio.AbstractEventLoop:
+    """
+    获取当前执行器线程的事件循环，首次调用时创建并在之后的任务执行中复用
+    
+    每个线程一个循环而不是所有线程共用一个：批量分析流程中有同步的数据库调用，
+    共用循环会让并发执行的任务互相阻塞
+    """
+    holder = getattr(_executor_thread_state, "holder", None)
+    if holder is None or holder.loop.is_closed():
+        holder = _ExecutorLoop()
+        asyncio.set_event_loop(holder.loop)
+        _executor_thread_state.holder = holder
+    return holder.loop
+
+
 def execute_scheduled_task(task_key: str):
     """
     可序列化的任务执行函数，供APScheduler调用
     这个函数必须是顶级函数，不能是类方法或lambda，以便APScheduler能够序列化
     """
-    import asyncio
-    from app.core.master_switch import master_switch
-    
     logger.info(f"🎯 APScheduler调用任务执行: {task_key}")
     
     # 检查总开关状态
@@ -861,14 +1082,30 @@ def execute_scheduled_task(task_key: str):
         logger.error(f"❌ 未找到任务配置: {task_key}")
         return
     
-    # 在新的事件循环中执行异步任务
+    # 达到并发执行上限时最多等待一个调度延迟宽限期；仍无空位则放弃本次触发，并记为一次失败执行
+    if not apscheduler_service._exec_sem.acquire(timeout=apscheduler_service._exec_wait_timeout):
+        logger.warning(
+            f"⚠️ 定时任务并发执行已达上限({apscheduler_service._max_executions})，"
+            f"等待{apscheduler_service._exec_wait_timeout}秒后仍无空位，跳过本次执行: {task_key}"
+        )
+        try:
+            with get_db_session() as db:
+                _get_executor_loop().run_until_complete(
+                    apscheduler_service._update_task_stats(db, task_key, success=False)
+                )
+        except Exception as e:
+            logger.debug(f"记录跳过执行失败: {task_key}, {e}")
+        return
+    
+    # 在执行器线程的事件循环中执行异步任务
     try:
-        # APScheduler在线程池中运行，需要创建新的事件循环
-        new_loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(new_loop)
+        # APScheduler在线程池中运行，线程内没有事件循环；循环按线程复用，不必每次触发都新建
+        loop = _get_executor_loop()
         try:
-            new_loop.run_until_complete(apscheduler_service._execute_task(config))
+            loop.run_until_complete(apscheduler_service._execute_task(config))
         finally:
-            new_loop.close()
+            _cancel_pending_tasks(loop)
     except Exception as e:
         logger.error(f"❌ 执行定时任务失败: {task_key}, {e}")
+    finally:
+        apscheduler_service._exec_sem.release()
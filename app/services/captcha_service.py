@@ -34,26 +34,31 @@ class CaptchaService:
             (128, 0, 128),  # 紫色
         ]
         self.noise_color = (200, 200, 200)
+        
+        # 默认字体只加载一次，每次生成验证码的每个字符都复用
+        self._font = ImageFont.load_default()
+        
+        # 随机坐标/偏移的取值范围（含两端，与 random.randint 一致），用 random.choices 一次取出一批
+        self._x_range = range(self.width + 1)
+        self._y_range = range(self.height + 1)
+        self._offset_range = range(5, 16)
     
     def _generate_text(self) -> str:
         """生成随机验证码文本"""
         return ''.join(random.choices(self.chars, k=self.char_count))
     
     def _add_noise_dots(self, draw: ImageDraw.Draw) -> None:
-        """添加噪点"""
-        for _ in range(50):
-            x = random.randint(0, self.width)
-            y = random.randint(0, self.height)
-            draw.point((x, y), fill=self.noise_color)
+        """添加噪点（一次 draw.point 调用绘制全部噪点）"""
+        xs = random.choices(self._x_range, k=50)
+        ys = random.choices(self._y_range, k=50)
+        draw.point(list(zip(xs, ys)), fill=self.noise_color)
     
     def _add_noise_lines(self, draw: ImageDraw.Draw) -> None:
         """添加干扰线"""
-        for _ in range(5):
-            x1 = random.randint(0, self.width)
-            y1 = random.randint(0, self.height)
-            x2 = random.randint(0, self.width)
-            y2 = random.randint(0, self.height)
-            draw.line([(x1, y1), (x2, y2)], fill=self.noise_color, width=1)
+        xs = random.choices(self._x_range, k=10)
+        ys = random.choices(self._y_range, k=10)
+        for i in range(0, 10, 2):
+            draw.line([(xs[i], ys[i]), (xs[i + 1], ys[i + 1])], fill=self.noise_color, width=1)
     
     def generate_captcha(self) -> Tuple[str, str]:
         """
@@ -62,10 +67,10 @@ class CaptchaService:
         Returns:
             Tuple[str, str]: (验证码文本, base64编码的图片)
         """
+        # 生成验证码文本（图片生成失败时也返回同一文本）
+        captcha_text = self._generate_text()
+        
         try:
-            # 生成验证码文本
-            captcha_text = self._generate_text()
-            
             # 创建图片
             image = Image.new('RGB', (self.width, self.height), self.bg_color)
             draw = ImageDraw.Draw(image)
@@ -73,31 +78,25 @@ class CaptchaService:
             # 添加噪点
             self._add_noise_dots(draw)
             
-            # 绘制文字
+            # 绘制文字：颜色和位置偏移一次取出
+            char_count = len(captcha_text)
             char_width = self.width // self.char_count
+            colors = random.choices(self.text_colors, k=char_count)
+            x_offsets = random.choices(self._offset_range, k=char_count)
+            y_offsets = random.choices(self._offset_range, k=char_count)
             for i, char in enumerate(captcha_text):
-                # 随机选择颜色
-                color = random.choice(self.text_colors)
-                
                 # 计算字符位置（添加随机偏移）
-                x = i * char_width + random.randint(5, 15)
-                y = random.randint(5, 15)
-                
-                # 尝试使用系统字体，如果失败则使用默认字体
-                try:
-                    # 这里可以指定字体文件路径，或使用系统默认字体
-                    font = ImageFont.load_default()
-                except:
-                    font = ImageFont.load_default()
-                
-                draw.text((x, y), char, fill=color, font=font)
+                x = i * char_width + x_offsets[i]
+                draw.text((x, y_offsets[i]), char, fill=colors[i], font=self._font)
             
             # 添加干扰线
             self._add_noise_lines(draw)
             
-            # 转换为base64
+            # 转换为base64：图片只有少量颜色，转为16色调色板后PNG体积约减半，
+            # 配合低压缩级别，编码耗时与原先的RGB默认压缩相当
+            image = image.convert('P', palette=Image.ADAPTIVE, colors=16)
             img_buffer = io.BytesIO()
-            image.save(img_buffer, format='PNG')
+            image.save(img_buffer, format='PNG', optimize=False, compress_level=1)
             img_buffer.seek(0)
             
             img_base64 = base64.b64encode(img_buffer.getvalue()).decode('utf-8')
@@ -109,8 +108,7 @@ class CaptchaService:
         except Exception as e:
             logger.error(f"生成验证码失败: {e}")
             # 如果图片生成失败，返回简单的文本验证码
-            simple_text = self._generate_text()
-            return simple_text, ""
+            return captcha_text, ""
 
 
 # 全局验证码服务实例
@@ -5,10 +5,14 @@
 import re
 import logging
 import time
+from collections import Counter
 from typing import List, Dict, Any, Tuple, Optional
 from datetime import datetime
 from sqlalchemy.orm import Session
 
+from app.models.denoise import denoise_record_manager
+from app.services.stage1_work_extraction import stage1_service
+
 logger = logging.getLogger(__name__)
 
 # 导入关键词配置管理器（延迟导入避免循环依赖）
@@ -18,15 +22,135 @@ def _get_keyword_config_manager():
     return keyword_config_manager
 
 
+# "空白或符号"规则中除空白外允许的符号
+_BLANK_SYMBOL_CHARS = frozenset("-_=+*.")
+# [a-zA-Z] 在忽略大小写匹配下等价的字符（含按Unicode大小写折叠匹配的 ſ 和开尔文符号 K）
+_IGNORECASE_ASCII_LETTERS = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ\u017f\u212a")
+
+
+def _is_blank_or_symbols(content: str) -> bool:
+    r"""等价于 ^[\s\-_=+\*\.]{1,10}$（\s 与 str.isspace 判定一致）"""
+    return 0 < len(content) <= 10 and all(char.isspace() or char in _BLANK_SYMBOL_CHARS for char in content)
+
+
+def _is_short_letters(content: str) -> bool:
+    """等价于忽略大小写的 ^[a-zA-Z]{1,3}$"""
+    return 0 < len(content) <= 3 and all(char in _IGNORECASE_ASCII_LETTERS for char in content)
+
+
+class _StringCheck:
+    """以字符串判断代替固定字符类正则，提供与 re.Pattern 相同的 match 接口"""
+    __slots__ = ("pattern", "_check")
+    
+    def __init__(self, pattern: str, check):
+        self.pattern = pattern
+        self._check = check
+    
+    def match(self, content: str) -> bool:
+        return self._check(content)
+
+
 class ContentDenoiser:
     """内容去噪器，用于过滤工单评论中的噪音数据"""
     
+    # 无效数据中的固定字符类模式（按配置原文识别）：对短字符串逐字符判断比走正则引擎快，
+    # 仍保留在配置顺序中的原位置，命中时返回的规则描述不变
+    _STRING_CHECKS = {
+        r"^[\s\-_=+\*\.]{1,10}$": _is_blank_or_symbols,
+        r"^[a-zA-Z]{1,3}$": _is_short_letters,
+    }
+    
+    # 数字/空白之外允许出现在"主要为数字或符号"内容中的符号
+    _QUALITY_SYMBOL_CHARS = frozenset("-_=+*.")
+    # 含反向引用的正则：合并进同一个正则后分组编号会错位，只能单独匹配
+    _BACKREFERENCE_RE = re.compile(r'\\[1-9]|\(\?P=')
+    # 模式开头的 .* / .*? ：search 时是否命中与去掉它完全等价，保留则每个起始位置都要回溯一遍
+    _LEADING_WILDCARD_RE = re.compile(r'^(?:\.\*\??)+')
+    
     def __init__(self):
         """初始化去噪器"""
         # 改为动态加载配置，不再使用硬编码
         self.normal_operation_patterns = []
         self.invalid_data_patterns = []
         self.system_keywords = []
+        # 加载配置时预编译的 (正则, 规则描述)，逐条评论匹配时直接使用
+        self._normal_operation_regexes: List[Tuple[re.Pattern, str]] = []
+        self._invalid_data_regexes: List[Tuple[re.Pattern, str]] = []
+        # 合并后的正则与未能合并的正则，用于一次扫描快速判断是否命中任一模式
+        self._normal_operation_union: Optional[re.Pattern] = None
+        self._normal_operation_unfused: List[Tuple[re.Pattern, str]] = []
+        self._invalid_data_union: Optional[re.Pattern] = None
+        self._invalid_data_unfused: List[Tuple[re.Pattern, str]] = []
+        # 系统关键词合并成的字面量交替正则，一次扫描判断是否包含任一关键词
+        self._system_keyword_union: Optional[re.Pattern] = None
+    
+    @classmethod
+    def _compile_patterns(cls, pattern_configs: List[Dict[str, Any]], default_description: str, for_search: bool = False) -> List[Tuple[re.Pattern, str]]:
+        """
+        预编译模式配置中的正则（忽略大小写）
+        
+        配置列表可能来自关键词配置管理器的共享缓存，因此不修改原字典，而是另行返回编译结果；
+        无法编译的正则记录警告后跳过。for_search 为 True 时（只用于 search）去掉开头的 .* / .*?
+        """
+        compiled = []
+        for pattern_config in pattern_configs:
+            # 兼容两种数据格式：数据库格式和原硬编码格式
+            pattern = pattern_config.get("pattern") or pattern_config.get("pattern_value")
+            if not pattern:
+                continue
+            if for_search:
+                pattern = cls._LEADING_WILDCARD_RE.sub("", pattern) or pattern
+            else:
+                check = cls._STRING_CHECKS.get(pattern)
+                if check is not None:
+                    compiled.append((_StringCheck(pattern, check), pattern_config.get("description") or default_description))
+                    continue
+            try:
+                regex = re.compile(pattern, re.IGNORECASE)
+            except re.error as e:
+                logger.warning(f"去噪模式正则无效，已跳过: {pattern_config.get('name') or pattern_config.get('pattern_name')} - {e}")
+                continue
+            compiled.append((regex, pattern_config.get("description") or default_description))
+        return compiled
+    
+    @classmethod
+    def _build_union(cls, compiled: List[Tuple[re.Pattern, str]]) -> Tuple[Optional[re.Pattern], List[Tuple[re.Pattern, str]]]:
+        """
+        把多个模式合并为一个交替正则，每条评论只需扫描一次即可判断是否命中任一模式
+        
+        合并正则只用于判断是否命中；命中后仍按配置顺序逐个匹配，保证返回的规则描述与配置优先级一致。
+        含反向引用的模式和字符串判断不参与合并；合并失败（如模式中间带全局内联标志）时返回 None，退回逐个匹配
+        
+        Returns:
+            (合并后的正则, 未参与合并的模式)
+        """
+        fused = []
+        unfused = []
+        for regex, description in compiled:
+            if isinstance(regex, _StringCheck) or (regex.groups and cls._BACKREFERENCE_RE.search(regex.pattern)):
+                unfused.append((regex, description))
+            else:
+                fused.append(regex.pattern)
+        
+        if not fused:
+            return None, compiled
+        try:
+            union = re.compile("|".join(f"(?:{pattern})" for pattern in fused), re.IGNORECASE)
+        except re.error as e:
+            logger.debug(f"合并去噪模式正则失败，改为逐个匹配: {e}")
+            return None, compiled
+        return union, unfused
+    
+    def _set_denoise_patterns(self, normal_patterns: List[Dict[str, Any]], invalid_patterns: List[Dict[str, Any]], system_keywords: List[str]):
+        """设置去噪配置并预编译正则"""
+        self.normal_operation_patterns = normal_patterns
+        self.invalid_data_patterns = invalid_patterns
+        self.system_keywords = system_keywords
+        self._normal_operation_regexes = self._compile_patterns(normal_patterns, "正常操作模式", for_search=True)
+        self._invalid_data_regexes = self._compile_patterns(invalid_patterns, "无效数据模式")
+        self._normal_operation_union, self._normal_operation_unfused = self._build_union(self._normal_operation_regexes)
+        self._invalid_data_union, self._invalid_data_unfused = self._build_union(self._invalid_data_regexes)
+        self._system_keyword_union = re.compile("|".join(map(re.escape, system_keywords))) if system_keywords else None
 
     def _load_denoise_config(self, db: Session):
         """从数据库加载去噪配置"""
@@ -35,23 +159,24 @@ class ContentDenoiser:
             
             # 加载正常操作模式
             normal_patterns = config_manager.get_denoise_patterns(db, "normal_operation")
-            self.normal_operation_patterns = normal_patterns
             
             # 加载无效数据模式
             invalid_patterns = config_manager.get_denoise_patterns(db, "invalid_data")
-            self.invalid_data_patterns = invalid_patterns
             
             # 加载系统关键词
             system_keywords = config_manager.get_system_keywords(db)
-            self.system_keywords = system_keywords
+            
+            self._set_denoise_patterns(normal_patterns, invalid_patterns, system_keywords)
             
             logger.info(f"成功从数据库加载去噪配置: 正常操作模式 {len(normal_patterns)} 个, 无效数据模式 {len(invalid_patterns)} 个, 系统关键词 {len(system_keywords)} 个")
             
         except Exception as e:
             logger.error(f"从数据库加载去噪配置失败: {e}，使用默认配置")
-            self.normal_operation_patterns = self._get_fallback_normal_patterns()
-            self.invalid_data_patterns = self._get_fallback_invalid_patterns()
-            self.system_keywords = self._get_fallback_system_keywords()
+            self._set_denoise_patterns(
+                self._get_fallback_normal_patterns(),
+                self._get_fallback_invalid_patterns(),
+                self._get_fallback_system_keywords()
+            )
     
     def _get_fallback_normal_patterns(self) -> List[Dict[str, Any]]:
         """获取备用的正常操作模式配置"""
@@ -182,24 +307,25 @@ class ContentDenoiser:
         if user_type == "system":
             return True, "系统用户操作"
         
-        # 2. 检查是否包含系统关键词
-        for keyword in self.system_keywords:
-            if keyword in content:
-                return True, f"包含系统关键词: {keyword}"
-        
-        # 3. 检查正常操作模式
-        for pattern_config in self.normal_operation_patterns:
-            # 兼容两种数据格式：数据库格式和原硬编码格式
-            pattern = pattern_config.get("pattern") or pattern_config.get("pattern_value")
-            description = pattern_config.get("description")
-            
-            if pattern and re.search(pattern, content, re.IGNORECASE):
-                return True, description or "正常操作模式"
+        # 2. 检查是否包含系统关键词：先扫描一次判断是否包含任一关键词，
+        # 包含时再按配置顺序找出第一个关键词，保证返回的关键词与逐个检查时一致
+        keyword_union = self._system_keyword_union
+        if keyword_union is None or keyword_union.search(content):
+            for keyword in self.system_keywords:
+                if keyword in content:
+                    return True, f"包含系统关键词: {keyword}"
+        
+        # 3. 检查正常操作模式：先用合并正则扫描一次，未命中时只需再检查未合并的模式
+        union = self._normal_operation_union
+        regexes = self._normal_operation_regexes if union is None or union.search(content) else self._normal_operation_unfused
+        for regex, description in regexes:
+            if regex.search(content):
+                return True, description
         
         # 4. 检查特定格式的正常操作
         # 工单客服的标准操作格式
         if name and "工单客服" in name:
-            if re.match(r"^\d+$", content) and len(content) <= 10:
+            if len(content) <= 10 and content.isdecimal():
                 return True, "工单客服数字标记"
         
         return False, ""
@@ -228,17 +354,15 @@ class ContentDenoiser:
         if db is not None and not self.invalid_data_patterns:
             self._load_denoise_config(db)
         
-        # 检查无效数据模式
-        for pattern_config in self.invalid_data_patterns:
-            # 兼容两种数据格式：数据库格式和原硬编码格式
-            pattern = pattern_config.get("pattern") or pattern_config.get("pattern_value")
-            description = pattern_config.get("description")
-            
-            if pattern and re.match(pattern, content, re.IGNORECASE):
-                return True, description or "无效数据模式"
+        # 检查无效数据模式：先用合并正则匹配一次，未命中时只需再检查未合并的模式
+        union = self._invalid_data_union
+        regexes = self._invalid_data_regexes if union is None or union.match(content) else self._invalid_data_unfused
+        for regex, description in regexes:
+            if regex.match(content):
+                return True, description
         
         # 检查内容长度（太短可能无意义）
-        if len(content) <= 2 and not re.match(r'^[\u4e00-\u9fff]+$', content):  # 非中文且过短
+        if len(content) <= 2 and not all('\u4e00' <= char <= '\u9fff' for char in content):  # 非中文且过短
             return True, "内容过短且非中文"
         
         return False, ""
@@ -255,9 +379,10 @@ class ContentDenoiser:
             (是否应该过滤, 过滤原因)
         """
         content = str(comment.get("content", "")).strip()
-        user_type = comment.get("user_type", "")
-        name = comment.get("name", "")
-        
+        return self._classify_comment(content, comment.get("user_type", ""), comment.get("name", ""), db)
+    
+    def _classify_comment(self, content: str, user_type: str, name: str, db: Session = None) -> Tuple[bool, str]:
+        """按 (内容, 用户类型, 用户名) 判断评论是否应该被过滤，结果只取决于这三项和当前配置"""
         # 1. 检查是否为正常操作
         is_normal, normal_reason = self.is_normal_operation(content, user_type, name, db)
         if is_normal:
@@ -270,13 +395,20 @@ class ContentDenoiser:
         
         return False, ""
     
-    def filter_comments(self, comments: List[Dict[str, Any]], db: Session = None) -> Dict[str, Any]:
+    def filter_comments(
+        self,
+        comments: List[Dict[str, Any]],
+        db: Session = None,
+        classification_cache: Optional[Dict[Tuple[str, Any, Any], Tuple[bool, str]]] = None
+    ) -> Dict[str, Any]:
         """
         过滤评论列表，去除噪音数据
         
         Args:
             comments: 评论列表
             db: 数据库会话（用于加载配置）
+            classification_cache: 判断结果缓存，按 (内容, 用户类型, 用户名) 索引；
+                批量过滤时跨工单共用，重复出现的系统通知等评论只需判断一次。为空时仅在本次调用内复用
             
         Returns:
             {
@@ -298,43 +430,59 @@ class ContentDenoiser:
         
         logger.info(f"🔍 开始过滤评论，原始数量: {len(comments)}")
         
+        # 配置按需加载只需在批次开始时判断一次，逐条判断时不再传入会话
+        if db is not None and (not self.normal_operation_patterns or not self.system_keywords or not self.invalid_data_patterns):
+            self._load_denoise_config(db)
+        
         filtered_comments = []
-        removed_comments = []
-        filter_reasons = {}
+        # 被移除评论只记录下标和原因，详情在循环结束后按需构建
+        removed_indices = []
+        removed_reasons = []
+        classify_comment = self._classify_comment
+        if classification_cache is None:
+            classification_cache = {}
+        # 逐条过滤日志的格式化开销不小，未开启DEBUG时整体跳过
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
         
         for i, comment in enumerate(comments):
-            should_filter, reason = self.should_filter_comment(comment, db)
+            key = (str(comment.get("content", "")).strip(), comment.get("user_type", ""), comment.get("name", ""))
+            classification = classification_cache.get(key)
+            if classification is None:
+                classification = classification_cache[key] = classify_comment(*key)
+            should_filter, reason = classification
             
             if should_filter:
-                removed_comments.append({
-                    "index": i,
-                    "comment": comment,
-                    "reason": reason
-                })
-                
-                # 统计过滤原因
-                filter_reasons[reason] = filter_reasons.get(reason, 0) + 1
+                removed_indices.append(i)
+                removed_reasons.append(reason)
                 
-                logger.debug(f"⚠️ 过滤评论 #{i}: {comment.get('content', '')[:50]}... - 原因: {reason}")
+                if debug_enabled:
+                    logger.debug(f"⚠️ 过滤评论 #{i}: {str(comment.get('content', ''))[:50]}... - 原因: {reason}")
             else:
                 filtered_comments.append(comment)
         
+        # 统计过滤原因（按首次出现的顺序）
+        filter_reasons = dict(Counter(removed_reasons))
+        
         result = {
             "filtered_comments": filtered_comments,
             "original_count": len(comments),
             "filtered_count": len(filtered_comments),
-            "removed_count": len(removed_comments),
+            "removed_count": len(removed_indices),
             "filter_statistics": {
                 "filter_reasons": filter_reasons,
-                "removed_details": removed_comments[:10]  # 只保留前10个被移除的详情
+                # 只保留前10个被移除的详情
+                "removed_details": [
+                    {"index": i, "comment": comments[i], "reason": reason}
+                    for i, reason in zip(removed_indices[:10], removed_reasons)
+                ]
             }
         }
         
-        logger.info(f"✅ 评论过滤完成:")
-        logger.info(f"  📥 原始数量: {result['original_count']}")
-        logger.info(f"  📤 过滤后数量: {result['filtered_count']}")
-        logger.info(f"  🗑️ 移除数量: {result['removed_count']}")
-        logger.info(f"  📊 过滤率: {(result['removed_count'] / result['original_count'] * 100):.1f}%" if result['original_count'] > 0 else "0%")
+        # 批量过滤时每个工单都会调用一次，汇总信息合并为一行输出
+        logger.info(
+            f"✅ 评论过滤完成: 原始 {result['original_count']} 条, 过滤后 {result['filtered_count']} 条, "
+            f"移除 {result['removed_count']} 条, 过滤率 {result['removed_count'] / result['original_count'] * 100:.1f}%"
+        )
         
         if filter_reasons:
             logger.info("🔍 过滤原因统计:")
@@ -367,20 +515,20 @@ class ContentDenoiser:
         
         # 如果需要保存记录且有数据库连接
         if save_record and db and work_id:
+            # 批次记录、工单记录和批次统计写在保存点内，失败时只回滚保存点，
+            # 调用方会话中此前的改动不受影响
+            savepoint = db.begin_nested()
             try:
-                from app.models.denoise import denoise_record_manager
-                import time
-                
                 # 生成单独的批次ID
                 batch_id = denoise_record_manager.generate_batch_id()
                 
-                # 创建批次记录
-                denoise_record_manager.create_batch_record(db, batch_id, 1)
-                
-                # 保存工单去噪记录
+                # 创建批次记录并保存工单去噪记录
                 start_time = time.time()
-                success = denoise_record_manager.save_work_order_denoise_record(
-                    db, work_id, batch_id, filter_result
+                success = (
+                    denoise_record_manager.create_batch_record(db, batch_id, 1)
+                    and denoise_record_manager.save_work_order_denoise_record(
+                        db, work_id, batch_id, filter_result
+                    )
                 )
                 processing_time_ms = int((time.time() - start_time) * 1000)
                 
@@ -396,9 +544,14 @@ class ContentDenoiser:
                         "total_processing_time_ms": processing_time_ms
                     }
                     
-                    denoise_record_manager.update_batch_statistics(
-                        db, batch_id, batch_statistics, "COMPLETED"
+                    success = denoise_record_manager.update_batch_statistics(
+                        db, batch_id, batch_statistics, "COMPLETED", commit=False
                     )
+                
+                if success:
+                    # 释放保存点后与之前一样提交会话
+                    savepoint.commit()
+                    db.commit()
                     
                     logger.info(f"✅ 保存工单 {work_id} 去噪记录成功，批次: {batch_id}")
                     
@@ -409,10 +562,16 @@ class ContentDenoiser:
                         "processing_time_ms": processing_time_ms
                     }
                 else:
+                    savepoint.rollback()
                     logger.warning(f"⚠️ 保存工单 {work_id} 去噪记录失败")
                     filter_result["denoise_record"] = {"saved": False, "error": "保存失败"}
                     
             except Exception as e:
+                if savepoint.is_active:
+                    savepoint.rollback()
+                else:
+                    # 保存点已释放，失败发生在提交阶段，会话只能整体回滚
+                    db.rollback()
                 logger.error(f"❌ 保存工单 {work_id} 去噪记录异常: {e}")
                 filter_result["denoise_record"] = {"saved": False, "error": str(e)}
         else:
@@ -478,7 +637,8 @@ class ContentDenoiser:
             result["issues"].append("字符重复度高")
         
         # 是否包含有意义的信息
-        if re.match(r'^[\d\s\-_=+\*\.]+$', content):
+        symbol_chars = self._QUALITY_SYMBOL_CHARS
+        if content and all(char.isdecimal() or char.isspace() or char in symbol_chars for char in content):
             quality_score -= 0.4
             result["issues"].append("主要为数字或符号")
         
@@ -506,10 +666,8 @@ class ContentDenoiser:
         start_time = time.time()
         logger.info(f"🔍 开始批量过滤 {len(work_orders)} 个工单的评论")
         
-        # 导入记录管理器
         batch_id = None
         if save_records and db:
-            from app.models.denoise import denoise_record_manager
             batch_id = denoise_record_manager.generate_batch_id()
             denoise_record_manager.create_batch_record(db, batch_id, len(work_orders))
             logger.info(f"🏷️ 创建批次记录: {batch_id}")
@@ -520,27 +678,29 @@ class ContentDenoiser:
         global_filter_reasons = {}
         
         processed_orders = []
+        # 待保存的工单去噪结果，循环结束后一次性批量写入
+        pending_records = []
+        # 本批次内共用的评论判断结果缓存，批次结束即释放
+        classification_cache = {}
+        # 逐个工单的DEBUG日志只在开启时格式化
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
         
         for order in work_orders:
             work_id = order.get("work_id", "未知")
             comments_data = order.get("comments_data", {})
             
             if not comments_data or "messages" not in comments_data:
-                logger.debug(f"⏭️ 工单 {work_id} 无评论数据，跳过")
+                if debug_enabled:
+                    logger.debug(f"⏭️ 工单 {work_id} 无评论数据，跳过")
                 processed_orders.append(order)
                 continue
             
             # 过滤评论
-            filter_result = self.filter_comments(comments_data["messages"])
+            filter_result = self.filter_comments(comments_data["messages"], classification_cache=classification_cache)
             
-            # 保存单个工单的去噪记录
+            # 收集单个工单的去噪记录
             if save_records and db and batch_id:
-                work_start_time = time.time()
-                denoise_record_manager.save_work_order_denoise_record(
-                    db, work_id, batch_id, filter_result
-                )
-                work_processing_time = int((time.time() - work_start_time) * 1000)
-                logger.debug(f"💾 保存工单 {work_id} 去噪记录，耗时: {work_processing_time}ms")
+                pending_records.append((work_id, filter_result))
             
             # 更新统计
             total_original += filter_result["original_count"]
@@ -553,14 +713,17 @@ class ContentDenoiser:
             
             # 更新工单数据
             updated_order = order.copy()
-            if filter_result["filtered_count"] > 0:
+            if filter_result["removed_count"] == 0 and filter_result["filtered_count"] > 0:
+                # 没有评论被移除：评论数据原样保留，无需复制和重建对话文本
+                updated_order["comment_count"] = filter_result["filtered_count"]
+                updated_order["has_comments"] = True
+            elif filter_result["filtered_count"] > 0:
                 # 重新构建comments_data
                 updated_comments_data = comments_data.copy()
                 updated_comments_data["messages"] = filter_result["filtered_comments"]
                 updated_comments_data["total_messages"] = filter_result["filtered_count"]
                 
                 # 重新构建对话文本
-                from app.services.stage1_work_extraction import stage1_service
                 updated_comments_data["conversation_text"] = stage1_service.build_conversation_text(
                     filter_result["filtered_comments"]
                 )
@@ -584,7 +747,16 @@ class ContentDenoiser:
             
             processed_orders.append(updated_order)
             
-            logger.debug(f"📋 工单 {work_id}: {filter_result['original_count']} -> {filter_result['filtered_count']} 条评论")
+            if debug_enabled:
+                logger.debug(f"📋 工单 {work_id}: {filter_result['original_count']} -> {filter_result['filtered_count']} 条评论")
+        
+        # 批量保存工单去噪记录
+        records_saved = True
+        if save_records and db and batch_id and pending_records:
+            save_start_time = time.time()
+            records_saved = denoise_record_manager.save_work_order_denoise_records(db, batch_id, pending_records)
+            save_time_ms = int((time.time() - save_start_time) * 1000)
+            logger.debug(f"💾 批量保存 {len(pending_records)} 条去噪记录，耗时: {save_time_ms}ms")
         
         # 计算总处理时间
         total_processing_time_ms = int((time.time() - start_time) * 1000)
@@ -604,8 +776,17 @@ class ContentDenoiser:
             }
         }
         
-        # 保存批次统计
-        if save_records and db and batch_id:
+        if save_records and db and batch_id and not records_saved:
+            # 批次记录与工单去噪记录同属未提交事务，整体回滚后在新事务中重建批次并记为失败
+            db.rollback()
+            error_message = "批量保存工单去噪记录失败"
+            logger.error(f"❌ {error_message}，批次: {batch_id}")
+            denoise_record_manager.create_batch_record(db, batch_id, len(work_orders))
+            denoise_record_manager.update_batch_statistics(
+                db, batch_id, result["statistics"], "FAILED", error_message
+            )
+        # 保存批次统计（一次性提交批次记录和全部工单去噪记录）
+        elif save_records and db and batch_id:
             try:
                 denoise_record_manager.update_batch_statistics(
                     db, batch_id, result["statistics"], "COMPLETED"
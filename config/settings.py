@@ -199,6 +199,17 @@ class Settings:
     def data_batch_size_max(self) -> int:
         return config.get_int("data.batch.size.max", 50)
     
+    # 去噪记录配置
+    @property
+    def denoise_bulk_load_enabled(self) -> bool:
+        """是否允许超大批次走 LOAD DATA LOCAL INFILE（需MySQL服务端开启 local_infile）"""
+        return config.get_bool("denoise.bulk.load.enabled", False)
+    
+    @property
+    def denoise_bulk_load_threshold(self) -> int:
+        """批次记录数达到该值时改用 LOAD DATA LOCAL INFILE 写入"""
+        return config.get_int("denoise.bulk.load.threshold", 100000)
+    
     # 并发处理配置
     @property
     def concurrency_max_workers(self) -> int:
@@ -220,6 +231,31 @@ class Settings:
     def concurrency_background_workers(self) -> int:
         return config.get_int("concurrency.background.workers", 6)
     
+    @property
+    def concurrency_scheduler_workers(self) -> int:
+        """APScheduler 执行器线程数，0 表示按CPU核数自动计算"""
+        return config.get_int("concurrency.scheduler.workers", 0)
+    
+    @property
+    def concurrency_scheduler_jobstore_pool_size(self) -> int:
+        """APScheduler 作业存储的数据库连接池大小"""
+        return config.get_int("concurrency.scheduler.jobstore.pool.size", 5)
+    
+    @property
+    def concurrency_scheduler_coalesce(self) -> bool:
+        """定时任务错过多次执行时是否合并为一次补执行"""
+        return config.get_bool("concurrency.scheduler.coalesce", True)
+    
+    @property
+    def concurrency_scheduler_max_instances(self) -> int:
+        """同一定时任务允许同时运行的实例数"""
+        return config.get_int("concurrency.scheduler.max.instances", 1)
+    
+    @property
+    def concurrency_scheduler_max_concurrent_executions(self) -> int:
+        """所有定时任务合计同时执行的批量分析流程上限，超出时等待至多30秒（misfire_grace_time），仍无空位则跳过本次触发"""
+        return config.get_int("concurrency.scheduler.max.concurrent.executions", 4)
+    
     # 路径配置
     @property
     def project_root(self) -> Path:
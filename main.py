@@ -30,6 +30,7 @@ from app.api.keyword_config import router as keyword_config_router
 from app.services.apscheduler_service import apscheduler_service
 from app.core.security import security_middleware
 from app.core.concurrency import concurrency_manager
+from app.models.task import task_record
 
 
 @asynccontextmanager
@@ -215,6 +216,10 @@ async def lifespan(app: FastAPI):
         await apscheduler_service.stop()
         print_item("APScheduler", "已停止", "✅")
     
+    # 写入缓冲中的任务进度
+    task_record.flush_pending_progress()
+    print_item("任务进度缓冲", "已写入", "✅")
+    
     # 并发管理器关闭
     concurrency_manager.shutdown()
     print_item("并发管理器", "已关闭", "✅")
@@ -0,0 +1,6 @@
+-- 去噪统计摘要查询索引优化
+-- get_denoise_summary 按 status = 'COMPLETED' AND created_at >= :start_date 过滤批次表，
+-- 复合索引使其走范围扫描而非全表扫描；记录表已有 idx_created_at 覆盖 created_at >= :start_date
+
+ALTER TABLE `ai_denoise_batch_statistics`
+ADD INDEX `idx_status_created_at` (`status`, `created_at`);
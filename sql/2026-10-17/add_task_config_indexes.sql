@@ -0,0 +1,10 @@
+-- 任务配置调度查询索引优化
+-- get_enabled_scheduled_tasks / get_tasks_due_for_execution / get_scheduled_dispatch_info 均按
+-- is_enabled = TRUE AND task_type IN ('scheduled', 'both') 过滤并 ORDER BY priority, task_name，
+-- (is_enabled, task_type, priority, task_name) 复合索引使过滤走范围扫描，每个 task_type 分支内按索引有序；
+-- 原 idx_is_enabled 是其前缀，随之删除。
+-- 到期判断基于 last_execution_time 与各行 schedule_interval 的差值，无法走索引，不单独建索引
+
+ALTER TABLE `ai_task_configs`
+ADD INDEX `idx_enabled_type_priority` (`is_enabled`, `task_type`, `priority`, `task_name`),
+DROP INDEX `idx_is_enabled`;
@@ -0,0 +1,10 @@
+-- 任务执行记录查询索引优化
+-- get_task_records 常见的按类型+状态筛选后 ORDER BY start_time DESC 分页，
+-- (task_type, status, start_time) 复合索引可直接按索引顺序反向扫描并在 LIMIT 处停止，无需filesort；
+-- 原 idx_task_type_status 是其前缀，随之删除。
+-- 无筛选条件的列表与 get_task_statistics 的 start_time 范围过滤继续使用 idx_start_time
+-- （InnoDB 二级索引隐含主键，等价于 (start_time, id)，同时满足键集分页的 ORDER BY start_time DESC, id DESC）
+
+ALTER TABLE `ai_task_execution_records`
+ADD INDEX `idx_type_status_start_time` (`task_type`, `status`, `start_time`),
+DROP INDEX `idx_task_type_status`;